@@ -0,0 +1,108 @@
+# Memory held by 10k article records: the old per-article dicts vs NewsArticle
+#
+# Feed strings (title, link, description) are created before measuring, as they
+# would already exist after parsing, so the numbers are the cost of the record
+# itself plus anything it derives (dedup keys, display strings). MinHash signatures
+# are not kept on records: they live in the per-merge and !test_dup indexes.
+#
+#   python benchmarks/bench_article_memory.py [count]
+import gc
+import os
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DISCORD_TOKEN', 'benchmark')
+os.environ.setdefault('ARTICLE_DB', '')
+
+import news_bot
+
+WORDS = ("thị trường chứng khoán ngân hàng lãi suất giá vàng xuất khẩu doanh nghiệp "
+         "lợi nhuận quý cổ phiếu tăng giảm mạnh nhà đầu tư Fed inflation stocks rally "
+         "earnings oil prices bond yields dollar growth forecast").split()
+
+def feed_strings(count):
+    sources = [name for feeds in news_bot.RSS_FEEDS.values() for name in feeds]
+    now = int(time.time())
+    rows = []
+    for i in range(count):
+        title = " ".join(WORDS[(i * 7 + k * 3) % len(WORDS)] for k in range(14)) + f" {i}"
+        description = " ".join(WORDS[(i * 5 + k) % len(WORDS)] for k in range(55))[:400]
+        rows.append((title, f"https://example.com/tin-tuc/{i}-{title[:40].replace(' ', '-')}.html",
+                     sources[i % len(sources)], now - i * 37, description))
+    return rows
+
+def dict_record(title, link, source, published_ts, description):
+    """Shape of a news item before NewsArticle"""
+    vn_time = datetime.fromtimestamp(published_ts, tz=news_bot.VN_TIMEZONE)
+    return {
+        'title': title,
+        'link': link,
+        'source': source,
+        'published': vn_time,
+        'published_str': vn_time.strftime("%H:%M %d/%m"),
+        'description': description
+    }
+
+def measure(label, build, rows):
+    gc.collect()
+    tracemalloc.start()
+    records = build(rows)
+    gc.collect()
+    used = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    print(f"{label:<44} {used / 1e6:7.2f} MB  {used / len(rows):6.0f} B/article")
+    return records
+
+def build_dicts(rows):
+    return [dict_record(*row) for row in rows]
+
+def build_articles(rows):
+    return [news_bot.NewsArticle(*row) for row in rows]
+
+def build_dicts_seen(rows):
+    """Old global dedup cache: a normalized "title|link" key and a copied dict per article"""
+    records = build_dicts(rows)
+    seen = {}
+    for news_item in records:
+        cache_key = f"{news_bot.normalize_title(news_item['title'])}|{news_bot.normalize_link(news_item['link'])}"
+        seen[cache_key] = {
+            'title': news_item['title'],
+            'link': news_item['link'],
+            'source': news_item['source'],
+            'timestamp': news_bot.get_current_vietnam_datetime()
+        }
+    return records, seen
+
+def build_articles_seen(rows):
+    """SeenArticleCache holds a reference to the record, keyed by its precomputed keys"""
+    records = build_articles(rows)
+    seen = news_bot.SeenArticleCache(3600, len(records))
+    for news_item in records:
+        seen.add(news_item)
+    return records, seen
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    rows = feed_strings(count)
+    print(f"{count} articles, feed strings excluded")
+
+    measure("dict records", build_dicts, rows)
+    measure("dict records + global dedup entries", build_dicts_seen, rows)
+    measure("NewsArticle + SeenArticleCache entries", build_articles_seen, rows)
+    articles = measure("NewsArticle (fresh)", build_articles, rows)
+
+    # The only lazy field, filled in by a listing render
+    gc.collect()
+    tracemalloc.start()
+    for news in articles:
+        news.published_str, news.listing_field
+    gc.collect()
+    used = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    print(f"{'  + published_str (after a listing render)':<44} {used / 1e6:7.2f} MB  {used / count:6.0f} B/article")
+
+if __name__ == '__main__':
+    main()
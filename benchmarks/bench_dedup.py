@@ -0,0 +1,133 @@
+# Collection dedup time at 100, 1k and 10k articles: the old linear scans vs DedupIndex
+#
+# "linear" is the pre-index collection loop: every article is compared with every
+# accepted article, and with every global cache entry, re-normalizing both titles
+# each time. "DedupIndex" is the same check through is_duplicate_article_local and
+# a hash index; "merge" is the full merge_news_streams pass the bot runs, with
+# global dedup on and near-duplicate detection off so only exact dedup is timed.
+# About 10% of the articles repeat an earlier title from another source.
+#
+#   python benchmarks/bench_dedup.py [count ...]
+#   BENCH_LINEAR_MAX=1000 python benchmarks/bench_dedup.py   # skip the slow 10k linear run
+import os
+import random
+import sys
+import time
+from operator import attrgetter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DISCORD_TOKEN', 'benchmark')
+os.environ.setdefault('ARTICLE_DB', '')
+
+import news_bot
+
+WORDS = ("thị trường chứng khoán ngân hàng lãi suất giá vàng xuất khẩu doanh nghiệp "
+         "lợi nhuận quý cổ phiếu tăng giảm mạnh nhà đầu tư Fed inflation stocks rally "
+         "earnings oil prices bond yields dollar growth forecast").split()
+DUPLICATE_SHARE = 0.1
+SOURCES = 20
+LINEAR_MAX = int(os.getenv('BENCH_LINEAR_MAX', '10000'))  # the quadratic scan takes minutes at 10k
+
+def old_normalize_title(title):
+    """normalize_title before the index, including its per-call import"""
+    import re
+    normalized = re.sub(r'\s+', ' ', title.lower().strip())
+    normalized = re.sub(r'[.,!?;:\-\u2013\u2014]', '', normalized)
+    normalized = re.sub(r'["\'\u201c\u201d\u2018\u2019]', '', normalized)
+    return normalized
+
+def old_is_duplicate_local(news_item, existing_articles):
+    current_title = old_normalize_title(news_item['title'])
+    current_link = news_item['link'].lower().strip()
+    for existing in existing_articles:
+        if (current_title == old_normalize_title(existing['title'])
+                or current_link == existing['link'].lower().strip()):
+            return True
+    return False
+
+def old_is_duplicate_global(news_item, seen):
+    current_title = old_normalize_title(news_item['title'])
+    current_link = news_item['link'].lower().strip()
+    for existing in seen.values():
+        if (current_title == old_normalize_title(existing['title'])
+                or current_link == existing['link'].lower().strip()):
+            return True
+    seen[f"{current_title}|{current_link}"] = {'title': news_item['title'], 'link': news_item['link'],
+                                              'timestamp': time.monotonic()}
+    if len(seen) > news_bot.MAX_GLOBAL_CACHE:
+        for old_key, _ in sorted(seen.items(), key=lambda item: item[1]['timestamp'])[:100]:
+            del seen[old_key]
+    return False
+
+def make_streams(count, rng):
+    """Per-source newest-first NewsArticle lists"""
+    titles = []
+    streams = [[] for _ in range(SOURCES)]
+    now = int(time.time())
+    for i in range(count):
+        if titles and rng.random() < DUPLICATE_SHARE:
+            title = rng.choice(titles)
+        else:
+            title = " ".join(rng.choice(WORDS) for _ in range(12)) + f" {i}"
+            titles.append(title)
+        source = i % SOURCES
+        streams[source].append(news_bot.NewsArticle(
+            title, f"https://example.com/{source}/{i}", 'cafef_vimo', now - i * 17, ""
+        ))
+    return streams
+
+def collect_linear(streams):
+    all_news = []
+    seen = {}
+    for stream in streams:
+        for news in stream:
+            news_item = {'title': news.title, 'link': news.link, 'published': news.published_ts}
+            if old_is_duplicate_local(news_item, all_news) or old_is_duplicate_global(news_item, seen):
+                continue
+            all_news.append(news_item)
+    all_news.sort(key=lambda item: item['published'], reverse=True)
+    return len(all_news)
+
+def collect_index(streams):
+    all_news = []
+    seen_index = news_bot.DedupIndex()
+    news_bot.global_seen_articles.clear()
+    for stream in streams:
+        for news_item in stream:
+            if news_bot.is_duplicate_article_local(news_item, seen_index):
+                continue
+            if news_bot.is_duplicate_article_global(news_item, news_item.source):
+                continue
+            seen_index.add(*news_bot.get_dedup_keys(news_item), news_item.title)
+            all_news.append(news_item)
+    all_news.sort(key=attrgetter('published_ts'), reverse=True)
+    return len(all_news)
+
+def collect_merge(streams):
+    news_bot.global_seen_articles.clear()
+    return sum(1 for _ in news_bot.merge_news_streams(streams, use_global_dedup=True))
+
+def timed(collect, streams):
+    started = time.perf_counter()
+    kept = collect(streams)
+    return time.perf_counter() - started, kept
+
+def main():
+    counts = [int(arg) for arg in sys.argv[1:]] or [100, 1000, 10000]
+    news_bot.NEAR_DUP_THRESHOLD = 2  # exact dedup only
+    print(f"{'articles':>8} {'linear':>12} {'DedupIndex':>12} {'merge':>12}  kept (linear/index/merge)")
+
+    for count in counts:
+        streams = make_streams(count, random.Random(count))
+        index_time, kept = timed(collect_index, streams)
+        merge_time, merge_kept = timed(collect_merge, streams)
+        if count <= LINEAR_MAX:
+            linear_time, linear_kept = timed(collect_linear, streams)
+            linear = f"{linear_time * 1000:10.1f}ms"
+        else:
+            linear, linear_kept = f"{'-':>12}", kept
+        print(f"{count:>8} {linear} {index_time * 1000:10.1f}ms {merge_time * 1000:10.1f}ms  "
+              f"{linear_kept}/{kept}/{merge_kept}")
+
+if __name__ == '__main__':
+    main()
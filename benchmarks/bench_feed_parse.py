@@ -0,0 +1,81 @@
+# Feed parse time and peak memory: the lxml fast path vs feedparser
+#
+# Parses the feeds in benchmarks/fixtures/ (named after their RSS_FEEDS key) with
+# parse_feed_entries_fast, which stops after the entries the bot keeps, and with
+# feedparser.parse over the whole document, as the bot did before. Peak memory is
+# from tracemalloc, so it counts Python objects only; libxml2's own buffers are not
+# included (iterparse clears each item after reading it, which keeps them small).
+#
+#   python benchmarks/bench_feed_parse.py [limit]
+#   python benchmarks/bench_feed_parse.py --record   # refresh the fixtures from the live feeds
+import gc
+import glob
+import os
+import sys
+import timeit
+import tracemalloc
+import urllib.request
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import feedparser
+import parsing_workers
+
+FIXTURES = os.path.join(ROOT, 'benchmarks', 'fixtures')
+RECORD_URLS = {
+    'benzinga': 'https://www.benzinga.com/feed',
+    'seeking_alpha': 'https://seekingalpha.com/feed.xml',
+    'yahoo_finance_headlines': 'https://feeds.finance.yahoo.com/rss/2.0/headline',
+}
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+
+def record():
+    for name, url in RECORD_URLS.items():
+        request = urllib.request.Request(url, headers={'User-Agent': USER_AGENT})
+        with urllib.request.urlopen(request, timeout=15) as response:
+            content = response.read()
+        with open(os.path.join(FIXTURES, f"{name}.xml"), 'wb') as fixture:
+            fixture.write(content)
+        print(f"{name}: {len(content) // 1024} KB from {url}")
+
+def peak_bytes(parse):
+    gc.collect()
+    tracemalloc.start()
+    result = parse()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    del result
+    return peak
+
+def best_time(parse):
+    timer = timeit.Timer(parse)
+    loops, _ = timer.autorange()
+    return min(timer.repeat(5, loops)) / loops
+
+def main():
+    if sys.argv[1:] == ['--record']:
+        record()
+        return
+    limit = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+
+    print(f"first {limit} entries; feedparser parses the whole feed")
+    print(f"{'feed':<24} {'size':>7} {'items':>6} {'parser':<11} {'time':>10} {'peak':>10}")
+    for path in sorted(glob.glob(os.path.join(FIXTURES, '*.xml'))):
+        name = os.path.splitext(os.path.basename(path))[0]
+        with open(path, 'rb') as fixture:
+            content = fixture.read()
+
+        fast = parsing_workers.parse_feed_entries_fast(content, limit)
+        full = feedparser.parse(content)
+        assert [entry['link'] for entry in fast] == [entry.link for entry in full.entries[:limit]], name
+
+        for label, parse in (
+            ('lxml fast', lambda: parsing_workers.parse_feed_entries_fast(content, limit)),
+            ('feedparser', lambda: feedparser.parse(content)),
+        ):
+            print(f"{name:<24} {len(content) // 1024:>5}KB {len(full.entries):>6} {label:<11} "
+                  f"{best_time(parse) * 1000:8.2f}ms {peak_bytes(parse) / 1024:8.0f}KB")
+
+if __name__ == '__main__':
+    main()
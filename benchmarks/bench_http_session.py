@@ -0,0 +1,87 @@
+# Request latency: a new aiohttp session per request vs the shared pooled session
+#
+# "cold" opens and closes a ClientSession around every request, as fetches did before
+# the shared session; "pooled" goes through fetch_with_aiohttp_uncoalesced. Against the
+# built-in loopback server this only shows the TCP connect and session set-up cost;
+# pass a real https URL to include DNS and the TLS handshake.
+#
+#   python benchmarks/bench_http_session.py [url] [requests]
+import asyncio
+import http.server
+import os
+import statistics
+import sys
+import threading
+import time
+
+import aiohttp
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DISCORD_TOKEN', 'benchmark')
+os.environ.setdefault('ARTICLE_DB', '')
+
+import news_bot
+
+CONCURRENCY = 10
+BODY = b'<rss version="2.0"><channel>' + b'<item><title>x</title></item>' * 200 + b'</channel></rss>'
+
+class FeedHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # keep-alive, like real feed servers
+    disable_nagle_algorithm = True  # headers and body go out in separate writes
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/rss+xml')
+        self.send_header('Content-Length', str(len(BODY)))
+        self.end_headers()
+        self.wfile.write(BODY)
+
+    def log_message(self, *args):
+        pass
+
+def start_local_server():
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), FeedHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f"http://127.0.0.1:{server.server_port}/feed.rss"
+
+async def fetch_cold(url):
+    headers = news_bot.get_enhanced_headers(url)
+    async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=8), headers=headers) as session:
+        async with session.get(url) as response:
+            return await response.read() if response.status == 200 else None
+
+async def fetch_pooled(url):
+    return await news_bot.fetch_with_aiohttp_uncoalesced(url)
+
+async def run(label, fetch, url, requests):
+    latencies = []
+    semaphore = asyncio.Semaphore(CONCURRENCY)
+
+    async def one():
+        async with semaphore:
+            started = time.perf_counter()
+            content = await fetch(url)
+            latencies.append(time.perf_counter() - started)
+            assert content, f"{label}: request failed"
+
+    await fetch(url)  # warm-up (imports, DNS, first connection)
+    started = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(requests)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    p95 = latencies[int(len(latencies) * 0.95) - 1]
+    print(f"{label:<7} {requests / elapsed:8.0f} req/s  "
+          f"p50 {statistics.median(latencies) * 1000:6.2f}ms  p95 {p95 * 1000:6.2f}ms")
+
+async def main():
+    url = sys.argv[1] if len(sys.argv) > 1 else start_local_server()
+    requests = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+    print(f"{requests} GETs of {url}, {CONCURRENCY} at a time")
+
+    await run('cold', fetch_cold, url, requests)
+    await run('pooled', fetch_pooled, url, requests)
+    await news_bot.close_http_session()
+
+if __name__ == '__main__':
+    asyncio.run(main())
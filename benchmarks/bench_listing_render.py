@@ -0,0 +1,71 @@
+# Listing page render time: ListingRenderer with and without its page cache
+#
+# "uncached" builds the embeds for every request, as each command did before the
+# shared renderer; "cached" is the bot's renderer, where every user after the first
+# on the same snapshot page gets the stored embed dicts back as fresh Embeds.
+# Articles go through story clustering first so the related-story counts are real.
+#
+#   python benchmarks/bench_listing_render.py [articles per source] [renders]
+import os
+import random
+import sys
+import time
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DISCORD_TOKEN', 'benchmark')
+os.environ.setdefault('ARTICLE_DB', '')
+
+import news_bot
+
+WORDS = ("thị trường chứng khoán ngân hàng lãi suất giá vàng xuất khẩu doanh nghiệp "
+         "lợi nhuận quý cổ phiếu tăng giảm mạnh nhà đầu tư Fed inflation stocks rally "
+         "earnings oil prices bond yields dollar growth forecast").split() + [f"tu{i}" for i in range(3000)]
+PAGES = 5
+RELATED_SHARE = 0.2  # articles that reuse an earlier title, so they join its story
+
+def make_lists(per_source, rng):
+    now = int(time.time())
+    lists = []
+    titles = []
+    for group in ('domestic', 'international'):
+        for source in news_bot.RSS_FEEDS[group]:
+            news_items = []
+            for i in range(per_source):
+                if titles and rng.random() < RELATED_SHARE:
+                    title, description = rng.choice(titles)
+                    title = f"{title} {i}"
+                else:
+                    title = " ".join(rng.choice(WORDS) for _ in range(14))
+                    description = " ".join(rng.choice(WORDS) for _ in range(40))
+                    titles.append((title, description))
+                news = news_bot.NewsArticle(title, f"https://example.com/{source}/{i}", source,
+                                            now - rng.randrange(86400), description)
+                news_bot.story_clusterer.add(news)
+                news_items.append(news)
+            news_items.sort(key=lambda news: news.published_ts, reverse=True)
+            lists.append(news_items)
+    return lists
+
+def main():
+    per_source = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    renders = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    lists = make_lists(per_source, random.Random(1))
+    snapshot = news_bot.TimelineSnapshot('all', news_bot.merge_news_streams(lists, collapse_stories=True),
+                                         sum(map(len, lists)))
+    for page in range(1, PAGES + 1):
+        snapshot.page(page)  # materialize up front, only rendering is timed
+    print(f"{sum(map(len, lists))} articles, !all pages 1-{PAGES}, {renders} renders each")
+
+    uncached = news_bot.ListingRenderer(0)  # every render is a miss
+    cached = news_bot.ListingRenderer(news_bot.LISTING_RENDER_CACHE_SIZE)
+    for page in range(1, PAGES + 1):
+        cached.render(snapshot, page, 'all')  # first user on each page
+
+    for label, renderer in (('uncached', uncached), ('cached', cached)):
+        timer = timeit.Timer(lambda: [renderer.render(snapshot, page, 'all') for page in range(1, PAGES + 1)])
+        per_render = min(timer.repeat(5, renders)) / (renders * PAGES)
+        print(f"{label:<9} {per_render * 1e6:8.1f} us/page  hits {renderer.stats['hits']} misses {renderer.stats['misses']}")
+
+if __name__ == '__main__':
+    main()
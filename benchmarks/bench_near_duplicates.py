@@ -0,0 +1,123 @@
+# Near-duplicate detection at 10k articles: MinHash-LSH lookups vs a linear scan
+#
+# Builds distinct articles plus reworded copies (one word swapped, one dropped) and
+# measures signature cost, LSH insert/lookup time against comparing with every
+# indexed signature, how many planted near-duplicates each approach finds, and
+# whether !test_dup finds an indexed article from its typed title.
+#
+#   python benchmarks/bench_near_duplicates.py [count]
+import gc
+import os
+import random
+import sys
+import time
+import tracemalloc
+from itertools import islice
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DISCORD_TOKEN', 'benchmark')
+os.environ.setdefault('ARTICLE_DB', '')
+
+import news_bot
+
+VOCABULARY = [f"tu{i}" for i in range(5000)] + (
+    "thị trường chứng khoán ngân hàng lãi suất giá vàng xuất khẩu doanh nghiệp "
+    "lợi nhuận quý cổ phiếu tăng giảm mạnh nhà đầu tư Fed inflation stocks rally "
+    "earnings oil prices bond yields dollar growth forecast").split()
+DUPLICATE_SHARE = 0.2  # reworded copies among the articles
+LINEAR_SAMPLE = 200
+
+def make_articles(count, rng):
+    originals = []
+    articles = []
+    duplicates = set()
+    for i in range(count):
+        if originals and rng.random() < DUPLICATE_SHARE:
+            title_words, description_words = rng.choice(originals)
+            title_words = list(title_words)
+            title_words[rng.randrange(len(title_words))] = rng.choice(VOCABULARY)
+            del title_words[rng.randrange(len(title_words))]
+            duplicates.add(i)
+        else:
+            title_words = rng.sample(VOCABULARY, 12)
+            description_words = rng.sample(VOCABULARY, 30)
+            originals.append((title_words, description_words))
+        articles.append(news_bot.NewsArticle(
+            " ".join(title_words), f"https://example.com/{i}", 'cafef_vimo',
+            1_700_000_000 - i, " ".join(description_words)
+        ))
+    return articles, duplicates
+
+def linear_find(indexed, signature, threshold):
+    for article, indexed_signature in indexed:
+        if news_bot.minhash_similarity(signature, indexed_signature) >= threshold:
+            return article
+    return None
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    threshold = news_bot.NEAR_DUP_THRESHOLD
+    articles, duplicates = make_articles(count, random.Random(42))
+    print(f"{count} articles, {len(duplicates)} reworded copies, threshold {threshold:.0%}")
+
+    started = time.perf_counter()
+    signatures = [news_bot.article_minhash(article) for article in articles]
+    elapsed = time.perf_counter() - started
+    print(f"{'signatures':<12} {elapsed * 1000:8.1f} ms  {elapsed / count * 1e6:6.1f} us/article")
+
+    # The merge path: look each article up, then index it if it is new
+    index = news_bot.MinHashIndex(threshold)
+    found = set()
+    started = time.perf_counter()
+    for position, (article, signature) in enumerate(zip(articles, signatures)):
+        if index.find(signature) is not None:
+            found.add(position)
+        else:
+            index.add(article, signature)
+    elapsed = time.perf_counter() - started
+    print(f"{'MinHash-LSH':<12} {elapsed * 1000:8.1f} ms  {elapsed / count * 1e6:6.1f} us/article  "
+          f"caught {len(found & duplicates)}/{len(duplicates)}  false hits {len(found - duplicates)}")
+
+    # A full linear merge is quadratic (minutes at 10k): time the last articles against all earlier ones
+    sample = signatures[-LINEAR_SAMPLE:]
+    earlier = news_bot.MinHashIndex(threshold)
+    for article, signature in zip(articles[:-LINEAR_SAMPLE], signatures):
+        earlier.add(article, signature)
+    indexed = list(earlier.entries.values())
+    started = time.perf_counter()
+    linear_found = {position for position, signature in enumerate(sample)
+                    if linear_find(indexed, signature, threshold) is not None}
+    elapsed = (time.perf_counter() - started) / len(sample)
+    lsh_found = {position for position, signature in enumerate(sample)
+                 if earlier.find(signature) is not None}
+    print(f"{'linear scan':<12} {elapsed * count * 1000:8.1f} ms  {elapsed * 1e6:6.1f} us/article  "
+          f"(extrapolated from the last {len(sample)}; LSH agrees on {len(linear_found & lsh_found)}/{len(linear_found)})")
+
+    # What an index costs per entry, signature included (the token cache is already warm)
+    del index, earlier, indexed
+    gc.collect()
+    tracemalloc.start()
+    index = news_bot.MinHashIndex(threshold)
+    for article in articles:
+        index.add(article)
+    gc.collect()
+    used = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    print(f"{'LSH index':<12} {used / 1e6:8.2f} MB  {used / len(index):6.0f} B/entry "
+          f"(of which {news_bot.MINHASH_PERMUTATIONS * 2} B signature)")
+
+    # !test_dup: the bot's capped, title-keyed index queried with typed titles
+    test_index = news_bot.MinHashIndex(threshold, news_bot.NEAR_DUP_MAX_ENTRIES, news_bot.title_minhash)
+    for article in articles:
+        test_index.add(article)
+    queries = list(islice(reversed(test_index.entries.values()), 1000))
+    started = time.perf_counter()
+    self_found = sum(1 for article, _ in queries
+                     if any(match is article and similarity >= threshold
+                            for similarity, match in test_index.nearest(news_bot.minhash_signature(article.title))))
+    elapsed = time.perf_counter() - started
+    print(f"{'!test_dup':<12} {elapsed / len(queries) * 1000:8.3f} ms/query against {len(test_index)} entries, "
+          f"exact title found {self_found}/{len(queries)}")
+
+if __name__ == '__main__':
+    main()
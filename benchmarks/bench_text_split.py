@@ -0,0 +1,85 @@
+# Splitting 50 KB of Vietnamese text for embeds: the old '. ' splitter vs split_text_for_discord
+#
+# "prose" is ordinary sentences; "lists" is a translated report whose lines end in
+# newlines, semicolons and colons with few '. ' breaks, where the old splitter
+# hard-cut huge "sentences" and dropped everything past 950 characters of each.
+# Also counts the embeds create_optimized_embeds needs before and after packing.
+#
+#   python benchmarks/bench_text_split.py [kilobytes]
+import os
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DISCORD_TOKEN', 'benchmark')
+os.environ.setdefault('ARTICLE_DB', '')
+
+import news_bot
+
+WORDS = ("thị trường chứng khoán ngân hàng lãi suất giá vàng xuất khẩu doanh nghiệp "
+         "lợi nhuận quý cổ phiếu tăng giảm mạnh nhà đầu tư tỷ giá đồng USD trái phiếu "
+         "Chính phủ kỳ hạn dự báo tăng trưởng GDP lạm phát Ngân hàng Nhà nước").split()
+
+def old_split_text_for_discord(text, max_length=950):
+    """split_text_for_discord before the boundary list"""
+    if len(text) <= max_length:
+        return [text]
+    parts = []
+    current_part = ""
+    for sentence in text.split('. '):
+        if len(current_part + sentence + '. ') <= max_length:
+            current_part += sentence + '. '
+        else:
+            if current_part:
+                parts.append(current_part.strip())
+                current_part = sentence + '. '
+            else:
+                parts.append(sentence[:max_length])
+                current_part = ""
+    if current_part:
+        parts.append(current_part.strip())
+    return parts
+
+def sentence(rng, low, high):
+    return " ".join(rng.choice(WORDS) for _ in range(rng.randint(low, high)))
+
+def make_prose(size, rng):
+    chunks, length = [], 0
+    while length < size:
+        chunk = sentence(rng, 8, 30).capitalize() + rng.choice(('. ', '. ', '. ', '! ', '? '))
+        chunks.append(chunk)
+        length += len(chunk)
+    return "".join(chunks)[:size]
+
+def make_lists(size, rng):
+    chunks, length = [], 0
+    while length < size:
+        chunk = "- " + sentence(rng, 6, 20) + rng.choice((";\n", ":\n", "\n", "; ", "… "))
+        chunks.append(chunk)
+        length += len(chunk)
+    return "".join(chunks)[:size]
+
+def kept_words(parts):
+    return sum(len(part.split()) for part in parts)
+
+def main():
+    size = (int(sys.argv[1]) if len(sys.argv) > 1 else 50) * 1000
+    rng = random.Random(7)
+    print(f"{size // 1000} KB inputs, 950-character parts")
+    print(f"{'input':<6} {'splitter':<5} {'time':>10} {'parts':>6} {'longest':>8} {'words kept':>11} {'embeds':>7}")
+
+    for label, text in (('prose', make_prose(size, rng)), ('lists', make_lists(size, rng))):
+        total_words = len(text.split())
+        for name, split in (('old', old_split_text_for_discord), ('new', news_bot.split_text_for_discord)):
+            timer = timeit.Timer(lambda: split(text))
+            loops, _ = timer.autorange()
+            elapsed = min(timer.repeat(5, loops)) / loops
+            parts = split(text)
+            # The old create_optimized_embeds made one embed per part
+            embeds = len(parts) if name == 'old' else len(news_bot.create_optimized_embeds("Tiêu đề", text))
+            print(f"{label:<6} {name:<5} {elapsed * 1000:8.2f}ms {len(parts):>6} {max(map(len, parts)):>8} "
+                  f"{kept_words(parts) * 100 / total_words:10.1f}% {embeds:>7}")
+
+if __name__ == '__main__':
+    main()
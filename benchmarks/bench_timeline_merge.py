@@ -0,0 +1,73 @@
+# Building the first listing page: concatenate-and-sort vs the lazy heap merge
+#
+# "concat+sort" is the old collection: every source's articles in one list, sorted
+# by publish time, then deduplicated in full. "merge, page 1" pulls only the
+# articles the first page needs through merge_news_streams; "merge, full" drains it,
+# which is what a user paging to the end costs. Sources are newest-first, as the
+# store keeps them. Near-duplicate detection is off so only ordering and exact
+# dedup are compared.
+#
+#   python benchmarks/bench_timeline_merge.py [sources] [articles per source ...]
+import os
+import random
+import sys
+import time
+import timeit
+from operator import attrgetter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DISCORD_TOKEN', 'benchmark')
+os.environ.setdefault('ARTICLE_DB', '')
+
+import news_bot
+
+PER_PAGE = news_bot.ITEMS_PER_PAGE
+
+def make_lists(sources, per_source, rng):
+    now = int(time.time())
+    lists = []
+    for source in range(sources):
+        published = sorted((now - rng.randrange(86400 * 3) for _ in range(per_source)), reverse=True)
+        lists.append([
+            news_bot.NewsArticle(f"Tin {source}-{i} thị trường", f"https://example.com/{source}/{i}",
+                                 'cafef_vimo', ts, "")
+            for i, ts in enumerate(published)
+        ])
+    return lists
+
+def concat_sort(lists):
+    all_news = []
+    for news_items in lists:
+        all_news.extend(news_items)
+    all_news.sort(key=attrgetter('published_ts'), reverse=True)
+    seen_index = news_bot.DedupIndex()
+    kept = [news for news in all_news if seen_index.add_if_new(news)]
+    return kept[:PER_PAGE]
+
+def merge_first_page(lists):
+    snapshot = news_bot.TimelineSnapshot('all', news_bot.merge_news_streams(lists), 0)
+    return snapshot.page(1)
+
+def merge_full(lists):
+    return list(news_bot.merge_news_streams(lists))
+
+def main():
+    sources = int(sys.argv[1]) if len(sys.argv) > 1 else 22
+    sizes = [int(arg) for arg in sys.argv[2:]] or [15, 20, 100, 1000]
+    news_bot.NEAR_DUP_THRESHOLD = 2  # exact dedup only
+    print(f"{sources} sources, {PER_PAGE} articles per page")
+    print(f"{'per source':>10} {'total':>7} {'concat+sort':>12} {'merge, page 1':>14} {'merge, full':>12}")
+
+    for per_source in sizes:
+        lists = make_lists(sources, per_source, random.Random(per_source))
+        assert [n.link for n in concat_sort(lists)] == [n.link for n in merge_first_page(lists)]
+
+        row = []
+        for build in (concat_sort, merge_first_page, merge_full):
+            timer = timeit.Timer(lambda: build(lists))
+            loops, _ = timer.autorange()
+            row.append(min(timer.repeat(5, loops)) / loops * 1000)
+        print(f"{per_source:>10} {sources * per_source:>7} {row[0]:10.3f}ms {row[1]:12.3f}ms {row[2]:10.3f}ms")
+
+if __name__ == '__main__':
+    main()
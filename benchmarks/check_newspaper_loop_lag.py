@@ -0,0 +1,145 @@
+# Event-loop lag while the Newspaper3k fallback runs
+#
+# Drives extract_content_uncached down its newspaper fallback with a stand-in parser
+# that keeps the CPU busy, while a ticker measures how late the event loop wakes up.
+# Exits non-zero if the loop stalls for longer than MAX_LAG_SECONDS on the path the bot
+# actually uses: the process pool, or the thread fallback when no pool can start.
+# The thread fallback is always measured too, for comparison - pure-Python parsers
+# contend for the GIL there, so its lag grows with concurrency.
+#
+# Before that, the real parsing_workers.extract_with_newspaper runs on a saved CafeF
+# page with the network blocked (newspaper's fetchers and socket connects raise), to
+# confirm the fallback parses the bytes it is given and never downloads the page again.
+#
+#   python benchmarks/check_newspaper_loop_lag.py
+import asyncio
+import os
+import socket
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DISCORD_TOKEN', 'benchmark')
+os.environ.setdefault('ARTICLE_DB', '')
+
+import news_bot
+import parsing_workers
+
+PARSE_SECONDS = 1.0     # per article, roughly a large page through Newspaper3k
+ARTICLES = 4            # extracted concurrently
+TICK_SECONDS = 0.01
+MAX_LAG_SECONDS = 0.1   # discord.py heartbeats tolerate far more, commands feel it sooner
+SOURCE_NAME = 'cafef_chungkhoan'  # domestic, so the traditional extractors run
+HTML = b'<html><body><p>placeholder</p></body></html>'
+FIXTURE_URL = 'https://cafef.vn/gia-vang-hom-nay-188251016091500000.chn'
+FIXTURE_HTML = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'cafef_article.html')
+
+def no_text(content):
+    """Trafilatura/BeautifulSoup found nothing - forces the newspaper fallback"""
+    return None
+
+def slow_newspaper(url, content):
+    """Stand-in for extract_with_newspaper: pure-Python work that holds the GIL"""
+    deadline = time.perf_counter() + PARSE_SECONDS
+    while time.perf_counter() < deadline:
+        pass
+    return "Nội dung bài báo đầy đủ. " * 40
+
+async def fake_fetch(url, headers=None, timeout=8):
+    return HTML
+
+async def no_delay():
+    return None
+
+async def ticker(stop, lags):
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        expected = loop.time() + TICK_SECONDS
+        await asyncio.sleep(TICK_SECONDS)
+        lags.append(loop.time() - expected)
+
+async def measure(label):
+    stop = asyncio.Event()
+    lags = []
+    tick_task = asyncio.create_task(ticker(stop, lags))
+
+    started = time.perf_counter()
+    results = await asyncio.gather(*(
+        news_bot.extract_content_uncached(f"https://cafef.vn/bai-{i}.chn", SOURCE_NAME)
+        for i in range(ARTICLES)
+    ))
+    elapsed = time.perf_counter() - started
+
+    stop.set()
+    await tick_task
+
+    assert all(result and not isinstance(result, news_bot.FallbackContent) for result in results)
+    lags.sort()
+    worst = lags[-1]
+    p99 = lags[int(len(lags) * 0.99) - 1]
+    print(f"{label:<8} {elapsed:6.2f}s wall  lag p99 {p99 * 1000:6.1f}ms  max {worst * 1000:6.1f}ms  ({len(lags)} ticks)")
+    return worst
+
+def check_no_download():
+    """Real Newspaper3k fallback on fixture HTML with every network path patched to raise"""
+    if not parsing_workers.NEWSPAPER_AVAILABLE:
+        print("newspaper  not installed - no-download check skipped")
+        return True
+    
+    import newspaper.network
+    attempts = []
+    
+    def blocked(name):
+        def refuse(*args, **kwargs):
+            attempts.append(name)
+            raise OSError(f"network blocked: {name}")
+        return refuse
+    
+    patches = [
+        (newspaper.network, 'get_html'),
+        (newspaper.network, 'get_html_2XX_only'),
+        (socket.socket, 'connect'),
+        (socket, 'create_connection'),
+    ]
+    originals = [(target, name, getattr(target, name)) for target, name in patches]
+    for target, name in patches:
+        setattr(target, name, blocked(name))
+    try:
+        with open(FIXTURE_HTML, 'rb') as fixture:
+            content = fixture.read()
+        text = parsing_workers.extract_with_newspaper(FIXTURE_URL, content)
+    except OSError:
+        text = None  # a blocked fetch escaped the extractor
+    finally:
+        for target, name, original in originals:
+            setattr(target, name, original)
+    
+    ok = bool(text) and 'vàng miếng SJC' in text and not attempts
+    print(f"newspaper  {len(text or '')} chars from fixture HTML, network attempts: {attempts or 'none'}"
+          f" - {'ok' if ok else 'FAILED'}")
+    return ok
+
+async def main():
+    no_download = check_no_download()
+    
+    news_bot.fetch_with_aiohttp = fake_fetch
+    news_bot.async_sleep_delay = no_delay
+    news_bot.extract_article_text = no_text
+    news_bot.extract_with_newspaper = slow_newspaper
+    news_bot.NEWSPAPER_AVAILABLE = True
+
+    # Thread fallback (PARSER_WORKERS=0 or a broken pool)
+    worst = await measure('threads')
+
+    # Process pool; warm it up so worker start-up isn't part of the measurement
+    news_bot.parsing_service.start()
+    if news_bot.parsing_service.executor is not None:
+        await news_bot.parsing_service.run(no_text, HTML)
+        worst = await measure('process')
+        news_bot.parsing_service.shutdown()
+
+    print(f"threshold {MAX_LAG_SECONDS * 1000:.0f}ms: {'ok' if worst <= MAX_LAG_SECONDS else 'EXCEEDED'}")
+    return 0 if worst <= MAX_LAG_SECONDS and no_download else 1
+
+if __name__ == '__main__':
+    sys.exit(asyncio.run(main()))
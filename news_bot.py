@@ -1,6 +1,5 @@
 import discord
 from discord.ext import commands
-import feedparser
 import asyncio
 import os
 import re
@@ -8,35 +7,37 @@ from datetime import datetime, timedelta
 import calendar
 from urllib.parse import urljoin, urlparse, quote
 import html
-import chardet
 import pytz
 import json
 import aiohttp
 from keep_alive import keep_alive
+from parsing_workers import NEWSPAPER_AVAILABLE, parse_feed_entries, extract_article_text, extract_with_newspaper
 from enum import Enum
 from typing import List, Dict, Tuple, Optional
 import random
+import itertools
 import hashlib
+import zlib
+import unicodedata
+import heapq
+import sys
+from operator import attrgetter
+import time
+import sqlite3
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from array import array
+from collections import OrderedDict, deque
+from itertools import islice
 
 # 🚀 OPTIMIZED LIBRARIES - Enhanced for async operations
 try:
-    import trafilatura
-    TRAFILATURA_AVAILABLE = True
+    import numpy as np
+    NUMPY_AVAILABLE = True
 except ImportError:
-    TRAFILATURA_AVAILABLE = False
-
-try:
-    import newspaper
-    from newspaper import Article
-    NEWSPAPER_AVAILABLE = True
-except ImportError:
-    NEWSPAPER_AVAILABLE = False
-
-try:
-    from bs4 import BeautifulSoup
-    BEAUTIFULSOUP_AVAILABLE = True
-except ImportError:
-    BEAUTIFULSOUP_AVAILABLE = False
+    NUMPY_AVAILABLE = False
 
 # 🆕 GEMINI ONLY - Enhanced AI System with Direct Content Access
 try:
@@ -48,7 +49,6 @@ except ImportError:
 # Bot configuration
 intents = discord.Intents.default()
 intents.message_content = True
-bot = commands.Bot(command_prefix='!', intents=intents)
 
 # 🔒 ENVIRONMENT VARIABLES
 TOKEN = os.getenv('DISCORD_TOKEN')
@@ -63,13 +63,19 @@ DISCORD_EMBED_FIELD_VALUE_LIMIT = 1000
 DISCORD_EMBED_DESCRIPTION_LIMIT = 4000
 DISCORD_EMBED_TITLE_LIMIT = 250
 DISCORD_EMBED_TOTAL_EMBED_LIMIT = 5800
+DISCORD_EMBED_FIELD_LIMIT = 25
 
 # User cache with deduplication
-user_news_cache = {}
 user_last_detail_cache = {}
-global_seen_articles = {}  # Global deduplication cache
-MAX_CACHE_ENTRIES = 25
 MAX_GLOBAL_CACHE = 1000
+CACHE_EXPIRE_HOURS = int(os.getenv('CACHE_EXPIRE_HOURS', '12'))
+
+# 🌐 SHARED HTTP CLIENT - One pooled session for the whole bot lifetime
+HTTP_CONNECTOR_LIMIT = int(os.getenv('HTTP_CONNECTOR_LIMIT', '64'))
+HTTP_LIMIT_PER_HOST = int(os.getenv('HTTP_LIMIT_PER_HOST', '6'))
+HTTP_DNS_CACHE_TTL = int(os.getenv('HTTP_DNS_CACHE_TTL', '300'))
+HTTP_KEEPALIVE_TIMEOUT = int(os.getenv('HTTP_KEEPALIVE_TIMEOUT', '60'))
+http_session: Optional[aiohttp.ClientSession] = None
 
 # 🔧 Enhanced User Agents for better compatibility
 USER_AGENTS = [
@@ -144,15 +150,36 @@ RSS_FEEDS = {
     }
 }
 
-def convert_utc_to_vietnam_time(utc_time_tuple):
-    """Convert UTC to Vietnam time"""
-    try:
-        utc_timestamp = calendar.timegm(utc_time_tuple)
-        utc_dt = datetime.fromtimestamp(utc_timestamp, tz=UTC_TIMEZONE)
-        vn_dt = utc_dt.astimezone(VN_TIMEZONE)
-        return vn_dt
-    except Exception as e:
-        return datetime.now(VN_TIMEZONE)
+# 🏷️ SOURCE DISPLAY - Shared by every listing and detail view
+SOURCE_DISPLAY_NAMES = {
+    # CafeF sources
+    'cafef_chungkhoan': 'CafeF CK', 'cafef_batdongsan': 'CafeF BĐS',
+    'cafef_taichinh': 'CafeF TC', 'cafef_vimo': 'CafeF VM', 'cafef_doanhnghiep': 'CafeF DN',
+    
+    # FREE international sources
+    'yahoo_finance_main': 'Yahoo RSS', 'yahoo_finance_headlines': 'Yahoo Headlines',
+    'yahoo_finance_rss': 'Yahoo Finance', 'cnn_money': 'CNN Money', 
+    'reuters_topnews': 'Reuters', 'reuters_business': 'Reuters Biz',
+    'marketwatch': 'MarketWatch', 'business_insider': 'Business Insider',
+    'cnbc': 'CNBC', 'investing_com': 'Investing.com', 
+    'investopedia': 'Investopedia', 'economic_times': 'Economic Times',
+    'bbc_business': 'BBC Business', 'guardian_business': 'The Guardian',
+    'coindesk': 'CoinDesk', 'nasdaq_news': 'Nasdaq',
+    'seeking_alpha': 'Seeking Alpha', 'benzinga': 'Benzinga'
+}
+
+SOURCE_EMOJIS = {
+    # CafeF sources
+    'cafef_chungkhoan': '📈', 'cafef_batdongsan': '🏢', 'cafef_taichinh': '💰', 
+    'cafef_vimo': '📊', 'cafef_doanhnghiep': '🏭',
+    
+    # FREE international sources
+    'yahoo_finance_main': '💼', 'yahoo_finance_headlines': '📰', 'yahoo_finance_rss': '💼',
+    'cnn_money': '📺', 'marketwatch': '📊', 'business_insider': '💼', 
+    'cnbc': '📺', 'investing_com': '💹', 'investopedia': '📚',
+    'bbc_business': '🇬🇧', 'guardian_business': '🛡️', 'coindesk': '₿',
+    'nasdaq_news': '📈', 'seeking_alpha': '🔍', 'benzinga': '🚀'
+}
 
 # 🆕 ENHANCED DEDUPLICATION SYSTEM
 def generate_article_hash(title, link, description=""):
@@ -162,83 +189,206 @@ def generate_article_hash(title, link, description=""):
     content = f"{clean_title}|{clean_link}"
     return hashlib.md5(content.encode('utf-8')).hexdigest()
 
-def clean_expired_cache():
-    """Clean expired articles from global cache"""
-    global global_seen_articles
-    current_time = get_current_vietnam_datetime()
-    expired_hashes = []
-    
-    for article_hash, article_data in global_seen_articles.items():
-        time_diff = current_time - article_data['timestamp']
-        if time_diff.total_seconds() > (CACHE_EXPIRE_HOURS * 3600):
-            expired_hashes.append(article_hash)
-    
-    for expired_hash in expired_hashes:
-        del global_seen_articles[expired_hash]
-    
-    if expired_hashes:
-        print(f"🧹 Cleaned {len(expired_hashes)} expired articles from cache")
+_WHITESPACE_RE = re.compile(r'\s+')
+_TITLE_PUNCTUATION_RE = re.compile(r'[.,!?;:\-\u2013\u2014]')
+_TITLE_QUOTES_RE = re.compile(r'["\'\u201c\u201d\u2018\u2019]')
 
 def normalize_title(title):
     """Normalize title for exact comparison"""
-    import re
     # Convert to lowercase and remove extra spaces
-    normalized = re.sub(r'\s+', ' ', title.lower().strip())
+    normalized = _WHITESPACE_RE.sub(' ', title.lower().strip())
     # Remove common punctuation that might vary
-    normalized = re.sub(r'[.,!?;:\-\u2013\u2014]', '', normalized)
+    normalized = _TITLE_PUNCTUATION_RE.sub('', normalized)
     # Remove quotes that might vary
-    normalized = re.sub(r'["\'\u201c\u201d\u2018\u2019]', '', normalized)
+    normalized = _TITLE_QUOTES_RE.sub('', normalized)
     return normalized
 
-def is_duplicate_article_local(news_item, existing_articles):
-    """Check duplicate within current collection - EXACT TITLE MATCH ONLY"""
-    current_title = normalize_title(news_item['title'])
-    current_link = news_item['link'].lower().strip()
+def normalize_link(link):
+    """Normalize link for exact comparison"""
+    return link.lower().strip()
+
+# 📰 ARTICLE RECORD - Compact, immutable, shared by reference everywhere
+class NewsArticle:
+    """One news item
+    
+    Collectors, the article store, user caches and renderers all hold references
+    to the same instance. Dedup keys are computed once at creation; the display
+    datetime and string are derived from the epoch timestamp on demand.
+    """
+    __slots__ = ('title', 'link', 'source', 'published_ts', 'description',
+                 'title_key', 'link_key', '_published_str')
+    
+    def __init__(self, title, link, source, published_ts, description=""):
+        set_slot = object.__setattr__
+        set_slot(self, 'title', title)
+        set_slot(self, 'link', link)
+        set_slot(self, 'source', sys.intern(source))
+        set_slot(self, 'published_ts', int(published_ts))
+        set_slot(self, 'description', description)
+        # Most links (and some titles) are already normalized: share the string
+        title_key = normalize_title(title)
+        link_key = normalize_link(link)
+        set_slot(self, 'title_key', title if title_key == title else title_key)
+        set_slot(self, 'link_key', link if link_key == link else link_key)
+        set_slot(self, '_published_str', None)
+    
+    def __setattr__(self, name, value):
+        raise AttributeError("NewsArticle is immutable")
+    
+    def __delattr__(self, name):
+        raise AttributeError("NewsArticle is immutable")
+    
+    @property
+    def published(self):
+        """Publish time as a Vietnam-timezone datetime"""
+        return datetime.fromtimestamp(self.published_ts, tz=VN_TIMEZONE)
+    
+    @property
+    def published_str(self):
+        """Display time, formatted once on first use"""
+        if self._published_str is None:
+            object.__setattr__(self, '_published_str', self.published.strftime("%H:%M %d/%m"))
+        return self._published_str
+    
+    @property
+    def listing_field(self):
+        """Validated (label, value) for listing embeds
+        
+        Not kept on the record: the emoji makes both strings 4 bytes per character,
+        and rendered listing pages are cached by ListingRenderer anyway.
+        """
+        emoji = SOURCE_EMOJIS.get(self.source, '📰')
+        title = self.title[:LISTING_TITLE_LENGTH] + "..." if len(self.title) > LISTING_TITLE_LENGTH else self.title
+        source_display = SOURCE_DISPLAY_NAMES.get(self.source, self.source)
+        return validate_embed_field(
+            f"{emoji} {title}",
+            f"🕰️ {self.published_str} • 📰 {source_display}\n🔗 [Đọc bài viết]({self.link})"
+        )
     
-    for existing in existing_articles:
-        existing_title = normalize_title(existing['title'])
-        existing_link = existing['link'].lower().strip()
-        
-        # Check exact title match OR exact link match
-        if current_title == existing_title or current_link == existing_link:
-            return True
+    def __repr__(self):
+        return f"NewsArticle({self.source!r}, {self.title[:40]!r})"
+
+def get_dedup_keys(news_item):
+    """(normalized title, normalized link) - computed once when the article was created"""
+    return news_item.title_key, news_item.link_key
+
+class DedupIndex:
+    """Hash index of normalized titles and links - O(1) exact duplicate checks"""
+    
+    def __init__(self):
+        self.titles = {}    # normalized title -> original title
+        self.links = set()  # normalized links
+    
+    def __len__(self):
+        return len(self.titles)
+    
+    def contains(self, title_key, link_key):
+        return title_key in self.titles or link_key in self.links
+    
+    def add(self, title_key, link_key, title=""):
+        self.titles[title_key] = title
+        self.links.add(link_key)
+    
+    def discard(self, title_key, link_key):
+        self.titles.pop(title_key, None)
+        self.links.discard(link_key)
+    
+    def add_if_new(self, news_item):
+        """Add the item unless it duplicates one already indexed; True if added"""
+        title_key, link_key = get_dedup_keys(news_item)
+        if self.contains(title_key, link_key):
+            return False
+        self.add(title_key, link_key, news_item.title)
+        return True
+    
+    def clear(self):
+        self.titles.clear()
+        self.links.clear()
+
+class SeenArticleCache:
+    """Global dedup cache with TTL and capacity - amortized O(1) insert and expiry
+    
+    Entries are kept in insertion order, which is also expiry order, so expired
+    or overflowing entries are always popped from the front.
+    """
+    
+    def __init__(self, ttl_seconds, max_entries):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.entries = OrderedDict()  # (title key, link key) -> (article, expires_at)
+        self.index = DedupIndex()
+    
+    def __len__(self):
+        return len(self.entries)
+    
+    def values(self):
+        """Cached articles, oldest first"""
+        return (article for article, _ in self.entries.values())
+    
+    def _pop_oldest(self):
+        (title_key, link_key), _ = self.entries.popitem(last=False)
+        self.index.discard(title_key, link_key)
+    
+    def expire(self):
+        """Drop entries past their TTL; returns how many were removed"""
+        now = time.monotonic()
+        removed = 0
+        while self.entries:
+            _, expires_at = next(iter(self.entries.values()))
+            if expires_at > now:
+                break
+            self._pop_oldest()
+            removed += 1
+        return removed
+    
+    def contains(self, title_key, link_key):
+        return self.index.contains(title_key, link_key)
+    
+    def find_title(self, title_key):
+        """Original title cached under a normalized title, or None"""
+        return self.index.titles.get(title_key)
+    
+    def add(self, news_item, ttl_seconds=None):
+        title_key, link_key = get_dedup_keys(news_item)
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        self.entries[(title_key, link_key)] = (news_item, time.monotonic() + ttl)
+        self.index.add(title_key, link_key, news_item.title)
+        
+        while len(self.entries) > self.max_entries:
+            self._pop_oldest()
+    
+    def remaining(self):
+        """(article, seconds left) pairs, oldest first - used to persist the cache"""
+        now = time.monotonic()
+        return [(article, expires_at - now) for article, expires_at in self.entries.values()]
+    
+    def clear(self):
+        self.entries.clear()
+        self.index.clear()
+
+global_seen_articles = SeenArticleCache(CACHE_EXPIRE_HOURS * 3600, MAX_GLOBAL_CACHE)
+
+def is_duplicate_article_local(news_item, seen_index):
+    """Check duplicate within current collection - EXACT TITLE MATCH ONLY"""
+    title_key, link_key = get_dedup_keys(news_item)
     
-    return False
+    # Check exact title match OR exact link match
+    return seen_index.contains(title_key, link_key)
 
 def is_duplicate_article_global(news_item, source_name):
     """Check duplicate against global cache - EXACT TITLE MATCH ONLY"""
-    global global_seen_articles
-    
     try:
-        # Clean expired cache first
-        clean_expired_cache()
+        # Expire old entries first (only pops what actually expired)
+        global_seen_articles.expire()
         
-        current_title = normalize_title(news_item['title'])
-        current_link = news_item['link'].lower().strip()
+        current_title, current_link = get_dedup_keys(news_item)
         
         # Check against global cache - EXACT matches only
-        for existing_data in global_seen_articles.values():
-            existing_title = normalize_title(existing_data['title'])
-            existing_link = existing_data['link'].lower().strip()
-            
-            if current_title == existing_title or current_link == existing_link:
-                return True
-        
-        # Add to global cache using simple key
-        cache_key = f"{current_title}|{current_link}"
-        
-        global_seen_articles[cache_key] = {
-            'title': news_item['title'],
-            'link': news_item['link'],
-            'source': source_name,
-            'timestamp': get_current_vietnam_datetime()
-        }
+        if global_seen_articles.contains(current_title, current_link):
+            return True
         
-        # Limit cache size
-        if len(global_seen_articles) > MAX_GLOBAL_CACHE:
-            sorted_items = sorted(global_seen_articles.items(), key=lambda x: x[1]['timestamp'])
-            for old_key, _ in sorted_items[:100]:
-                del global_seen_articles[old_key]
+        # Add to global cache (capacity is enforced on insert)
+        global_seen_articles.add(news_item)
         
         return False
         
@@ -297,7 +447,7 @@ async def async_sleep_delay():
     delay = random.uniform(0.1, 0.5)  # Much shorter delay
     await asyncio.sleep(delay)
 
-def get_enhanced_headers(url=None):
+def get_enhanced_headers(url=None, validators=None):
     """Enhanced headers for better compatibility - NO BROTLI"""
     user_agent = random.choice(USER_AGENTS)
     
@@ -313,6 +463,15 @@ def get_enhanced_headers(url=None):
         'Pragma': 'no-cache',
     }
     
+    # Conditional GET - let the server answer 304 when the feed is unchanged
+    if validators and (validators.get('etag') or validators.get('last_modified')):
+        del headers['Cache-Control']
+        del headers['Pragma']
+        if validators.get('etag'):
+            headers['If-None-Match'] = validators['etag']
+        if validators.get('last_modified'):
+            headers['If-Modified-Since'] = validators['last_modified']
+    
     if url and 'yahoo' in url.lower():
         headers.update({
             'Referer': 'https://finance.yahoo.com/',
@@ -335,6 +494,9 @@ def is_international_source(source_name):
     ]
     return any(source in source_name for source in international_sources)
 
+class FallbackContent(str):
+    """Placeholder text shown when extraction fails - never cached"""
+
 def create_fallback_content(url, source_name, error_msg=""):
     """Create fallback content when extraction fails"""
     try:
@@ -353,7 +515,7 @@ def create_fallback_content(url, source_name, error_msg=""):
             elif 'bbc' in source_name:
                 source_display = "BBC Business"
             
-            return f"""**{source_display} Financial News:**
+            return FallbackContent(f"""**{source_display} Financial News:**
 
 📈 **Market Analysis:** This article provides financial market insights and economic analysis.
 
@@ -366,9 +528,9 @@ def create_fallback_content(url, source_name, error_msg=""):
 **Article ID:** {article_id}
 **Note:** Content extraction failed. Please visit the original link for complete article.
 
-{f'**Technical Error:** {error_msg}' if error_msg else ''}"""
+{f'**Technical Error:** {error_msg}' if error_msg else ''}""")
         else:
-            return f"""**Tin tức kinh tế CafeF:**
+            return FallbackContent(f"""**Tin tức kinh tế CafeF:**
 
 📰 **Thông tin kinh tế:** Bài viết cung cấp thông tin kinh tế, tài chính từ CafeF.
 
@@ -381,12 +543,22 @@ def create_fallback_content(url, source_name, error_msg=""):
 **Mã bài viết:** {article_id}
 **Lưu ý:** Để đọc đầy đủ, vui lòng truy cập link gốc.
 
-{f'**Lỗi:** {error_msg}' if error_msg else ''}"""
+{f'**Lỗi:** {error_msg}' if error_msg else ''}""")
         
     except Exception as e:
-        return f"Nội dung từ {source_name}. Vui lòng truy cập link gốc để đọc đầy đủ."
+        return FallbackContent(f"Nội dung từ {source_name}. Vui lòng truy cập link gốc để đọc đầy đủ.")
 
-async def extract_content_with_gemini(url, source_name):
+async def extract_content_with_gemini(url, source_name, priority=None):
+    """Gemini extraction; concurrent requests for the same article share one call"""
+    if priority is None:
+        priority = PRIORITY_INTERACTIVE
+    
+    return await gemini_flight.do(
+        gemini_flight.key_for(normalize_article_url(url), priority),
+        lambda: extract_content_with_gemini_uncoalesced(url, source_name, priority)
+    )
+
+async def extract_content_with_gemini_uncoalesced(url, source_name, priority):
     """Use Gemini to extract and translate content from international news"""
     try:
         if not GEMINI_API_KEY or not GEMINI_AVAILABLE:
@@ -405,24 +577,20 @@ YÊU CẦU:
 **NỘI DUNG HOÀN CHỈNH:**"""
 
         try:
-            model = genai.GenerativeModel('gemini-2.0-flash-exp')
-            
-            generation_config = genai.types.GenerationConfig(
-                temperature=0.1,
-                top_p=0.8,
-                max_output_tokens=3000,  # Tăng từ 2000 để lấy toàn bộ nội dung
-            )
+            generation_config = {
+                'temperature': 0.1,
+                'top_p': 0.8,
+                'max_output_tokens': 3000  # Tăng từ 2000 để lấy toàn bộ nội dung
+            }
             
-            response = await asyncio.wait_for(
-                asyncio.to_thread(
-                    model.generate_content,
-                    extraction_prompt,
-                    generation_config=generation_config
-                ),
-                timeout=30  # Tăng timeout từ 20s
+            response_text = await gemini_scheduler.generate(
+                extraction_prompt,
+                generation_config,
+                priority=priority,
+                timeout=30
             )
             
-            extracted_content = response.text.strip()
+            extracted_content = response_text.strip()
             
             if len(extracted_content) > 300:
                 error_indicators = [
@@ -445,34 +613,413 @@ YÊU CẦU:
     except Exception as e:
         return create_fallback_content(url, source_name, str(e))
 
+# 🛬 REQUEST COALESCING - Identical concurrent calls share one in-flight future
+class SingleFlight:
+    """Concurrent callers with the same key await one shared task"""
+    
+    def __init__(self, name):
+        self.name = name
+        self.inflight = {}
+        self.stats = {'calls': 0, 'shared': 0}
+    
+    async def do(self, key, coro_factory):
+        self.stats['calls'] += 1
+        
+        task = self.inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(coro_factory())
+            self.inflight[key] = task
+            task.add_done_callback(lambda done, key=key: self._finish(key, done))
+        else:
+            self.stats['shared'] += 1
+        
+        # Shield so one caller timing out doesn't cancel the others
+        return await asyncio.shield(task)
+    
+    def key_for(self, key, priority):
+        """Background work may join an interactive flight, never the other way round
+        
+        A background flight keeps its low queue priority and its own timeout, so an
+        interactive caller gets a separate flight instead of waiting behind it.
+        """
+        if priority == PRIORITY_BACKGROUND and key not in self.inflight:
+            return (key, PRIORITY_BACKGROUND)
+        return key
+    
+    def _finish(self, key, task):
+        if self.inflight.get(key) is task:
+            del self.inflight[key]
+        if not task.cancelled():
+            task.exception()  # mark retrieved even if every waiter went away
+
+fetch_flight = SingleFlight('fetch')
+feed_flight = SingleFlight('feed')
+extract_flight = SingleFlight('extract')
+gemini_flight = SingleFlight('gemini')
+
 # 🚀 ASYNC HTTP CLIENT - NO MORE BLOCKING REQUESTS
+async def get_http_session() -> aiohttp.ClientSession:
+    """Get the shared pooled session, creating it on first use"""
+    global http_session
+    
+    if http_session is None or http_session.closed:
+        connector = aiohttp.TCPConnector(
+            limit=HTTP_CONNECTOR_LIMIT,
+            limit_per_host=HTTP_LIMIT_PER_HOST,
+            ttl_dns_cache=HTTP_DNS_CACHE_TTL,
+            use_dns_cache=True,
+            keepalive_timeout=HTTP_KEEPALIVE_TIMEOUT,
+            enable_cleanup_closed=True
+        )
+        http_session = aiohttp.ClientSession(connector=connector)
+        print(f"🌐 HTTP session ready (limit={HTTP_CONNECTOR_LIMIT}, per host={HTTP_LIMIT_PER_HOST})")
+    
+    return http_session
+
+async def close_http_session():
+    """Close the shared session and release pooled connections"""
+    global http_session
+    
+    if http_session is not None and not http_session.closed:
+        await http_session.close()
+        print("🌐 HTTP session closed")
+    http_session = None
+
 async def fetch_with_aiohttp(url, headers=None, timeout=8):
+    """Fetch a URL; concurrent fetches of the same URL share one request"""
+    if headers is not None:
+        return await fetch_with_aiohttp_uncoalesced(url, headers, timeout)
+    
+    return await fetch_flight.do(url, lambda: fetch_with_aiohttp_uncoalesced(url, None, timeout))
+
+async def fetch_with_aiohttp_uncoalesced(url, headers=None, timeout=8):
     """FIXED: Use aiohttp instead of requests to prevent blocking"""
     try:
         if headers is None:
             headers = get_enhanced_headers(url)
         
         timeout_config = aiohttp.ClientTimeout(total=timeout)
+        session = await get_http_session()
         
-        async with aiohttp.ClientSession(timeout=timeout_config, headers=headers) as session:
-            async with session.get(url) as response:
-                if response.status == 200:
-                    content = await response.read()
-                    return content
-                else:
-                    return None
+        async with session.get(url, headers=headers, timeout=timeout_config) as response:
+            if response.status == 200:
+                content = await response.read()
+                return content
+            else:
+                return None
     except Exception as e:
         print(f"❌ aiohttp fetch error for {url}: {e}")
         return None
 
+# 📡 CONDITIONAL FEED FETCH - ETag / Last-Modified validators per feed
+feed_http_cache = {}  # rss_url -> validators, last parsed items and counters
+
+def get_feed_http_state(rss_url):
+    """Per-feed validator state, created on first use"""
+    state = feed_http_cache.get(rss_url)
+    if state is None:
+        state = {
+            'etag': None,
+            'last_modified': None,
+            'news': None,
+            'limit': None,
+            'hits': 0,     # 304 Not Modified
+            'misses': 0,   # full download
+            'errors': 0,
+            'last_status': None,
+            'entries': {},     # (guid/link, epoch seconds) -> news item (None if filtered out)
+            'new': 0,          # last poll
+            'reused': 0,
+            'total_new': 0,
+            'total_reused': 0
+        }
+        feed_http_cache[rss_url] = state
+    return state
+
+async def fetch_feed_conditional(rss_url, state, timeout=8):
+    """Fetch a feed with validators; returns (status, content, (etag, last_modified))
+    
+    The new validators are not written to state here: the caller commits them
+    together with the parsed articles, so a body that fails to parse is fetched
+    again instead of being answered with 304 and the previous articles.
+    """
+    try:
+        # Only revalidate when we still hold the parsed result to fall back on
+        validators = state if state['news'] is not None else None
+        headers = get_enhanced_headers(rss_url, validators)
+        
+        timeout_config = aiohttp.ClientTimeout(total=timeout)
+        session = await get_http_session()
+        
+        async with session.get(rss_url, headers=headers, timeout=timeout_config) as response:
+            state['last_status'] = response.status
+            
+            if response.status == 304:
+                return 304, None, None
+            
+            if response.status == 200:
+                content = await response.read()
+                return 200, content, (response.headers.get('ETag'), response.headers.get('Last-Modified'))
+            
+            return response.status, None, None
+    except Exception as e:
+        print(f"❌ Feed fetch error for {rss_url}: {e}")
+        return None, None, None
+
+# 💾 CONTENT CACHE - Extracted article text keyed by normalized URL
+CONTENT_CACHE_TTL = int(os.getenv('CONTENT_CACHE_TTL', str(24 * 3600)))
+CONTENT_CACHE_MAX_BYTES = int(os.getenv('CONTENT_CACHE_MAX_BYTES', str(8 * 1024 * 1024)))
+CONTENT_CACHE_DISK_MAX_BYTES = int(os.getenv('CONTENT_CACHE_DISK_MAX_BYTES', str(64 * 1024 * 1024)))
+CONTENT_CACHE_DB = os.getenv('CONTENT_CACHE_DB', 'news_cache.db')  # empty = memory only
+
+TRACKING_QUERY_PARAMS = ('utm_', 'fbclid', 'gclid', 'guccounter', 'guce_')
+
+def normalize_article_url(url):
+    """Canonical cache key for an article URL"""
+    parsed = urlparse(url.strip())
+    query = '&'.join(
+        part for part in parsed.query.split('&')
+        if part and not part.lower().startswith(TRACKING_QUERY_PARAMS)
+    )
+    path = parsed.path.rstrip('/') or '/'
+    normalized = f"{parsed.scheme.lower()}://{parsed.netloc.lower()}{path}"
+    return f"{normalized}?{query}" if query else normalized
+
+class ContentCache:
+    """Two-layer text cache: in-memory LRU bounded by bytes, plus optional SQLite on disk"""
+    
+    def __init__(self, ttl_seconds, max_bytes, db_path="", disk_max_bytes=0,
+                 table='content_cache', key_func=normalize_article_url):
+        self.ttl_seconds = ttl_seconds
+        self.table = table
+        self.key_func = key_func
+        self.max_bytes = max_bytes
+        self.db_path = db_path
+        self.disk_max_bytes = disk_max_bytes
+        self.memory = OrderedDict()  # key -> (content, expires_at, size)
+        self.memory_bytes = 0
+        self.stats = {'memory_hits': 0, 'disk_hits': 0, 'misses': 0, 'stores': 0}
+        self._db = None
+        self._db_lock = threading.Lock()
+    
+    # --- memory layer ---
+    def _memory_get(self, key):
+        entry = self.memory.get(key)
+        if entry is None:
+            return None
+        
+        content, expires_at, size = entry
+        if expires_at <= time.time():
+            del self.memory[key]
+            self.memory_bytes -= size
+            return None
+        
+        self.memory.move_to_end(key)
+        return content
+    
+    def _memory_set(self, key, content, expires_at):
+        size = len(content.encode('utf-8'))
+        if size > self.max_bytes:
+            return
+        
+        old_entry = self.memory.pop(key, None)
+        if old_entry:
+            self.memory_bytes -= old_entry[2]
+        
+        self.memory[key] = (content, expires_at, size)
+        self.memory_bytes += size
+        
+        while self.memory_bytes > self.max_bytes:
+            _, (_, _, evicted_size) = self.memory.popitem(last=False)
+            self.memory_bytes -= evicted_size
+    
+    # --- disk layer (runs in a worker thread) ---
+    def _connect(self):
+        if self._db is None:
+            self._db = sqlite3.connect(self.db_path, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.execute(f"""CREATE TABLE IF NOT EXISTS {self.table} (
+                url TEXT PRIMARY KEY,
+                content TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                expires_at REAL NOT NULL
+            )""")
+            self._db.execute(f"CREATE INDEX IF NOT EXISTS idx_{self.table}_created ON {self.table}(created_at)")
+            self._db.commit()
+        return self._db
+    
+    def _disk_get(self, key):
+        with self._db_lock:
+            row = self._connect().execute(
+                f"SELECT content, expires_at FROM {self.table} WHERE url = ? AND expires_at > ?",
+                (key, time.time())
+            ).fetchone()
+        return row
+    
+    def _disk_set(self, key, content, expires_at):
+        now = time.time()
+        with self._db_lock:
+            db = self._connect()
+            db.execute(
+                f"INSERT OR REPLACE INTO {self.table} (url, content, size, created_at, expires_at) VALUES (?, ?, ?, ?, ?)",
+                (key, content, len(content.encode('utf-8')), now, expires_at)
+            )
+            db.execute(f"DELETE FROM {self.table} WHERE expires_at <= ?", (now,))
+            
+            # Enforce the disk size budget, oldest first
+            total_bytes = db.execute(f"SELECT COALESCE(SUM(size), 0) FROM {self.table}").fetchone()[0]
+            if total_bytes > self.disk_max_bytes:
+                db.execute(
+                    f"""DELETE FROM {self.table} WHERE url IN (
+                        SELECT url FROM (
+                            SELECT url, SUM(size) OVER (ORDER BY created_at DESC) AS running
+                            FROM {self.table}
+                        ) WHERE running > ?
+                    )""",
+                    (self.disk_max_bytes,)
+                )
+            db.commit()
+    
+    # --- public API ---
+    async def get(self, url):
+        key = self.key_func(url) if self.key_func else url
+        
+        content = self._memory_get(key)
+        if content is not None:
+            self.stats['memory_hits'] += 1
+            return content
+        
+        if self.db_path:
+            try:
+                row = await asyncio.to_thread(self._disk_get, key)
+            except Exception as e:
+                print(f"⚠️ Content cache read error: {e}")
+                row = None
+            
+            if row:
+                self.stats['disk_hits'] += 1
+                self._memory_set(key, row[0], row[1])
+                return row[0]
+        
+        self.stats['misses'] += 1
+        return None
+    
+    async def set(self, url, content, ttl_seconds=None):
+        key = self.key_func(url) if self.key_func else url
+        expires_at = time.time() + (ttl_seconds if ttl_seconds is not None else self.ttl_seconds)
+        
+        self._memory_set(key, content, expires_at)
+        self.stats['stores'] += 1
+        
+        if self.db_path:
+            try:
+                await asyncio.to_thread(self._disk_set, key, content, expires_at)
+            except Exception as e:
+                print(f"⚠️ Content cache write error: {e}")
+    
+    def hit_rate(self):
+        hits = self.stats['memory_hits'] + self.stats['disk_hits']
+        total = hits + self.stats['misses']
+        return (hits / total * 100) if total else 0
+    
+    def close(self):
+        with self._db_lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+content_cache = ContentCache(
+    CONTENT_CACHE_TTL,
+    CONTENT_CACHE_MAX_BYTES,
+    CONTENT_CACHE_DB,
+    CONTENT_CACHE_DISK_MAX_BYTES
+)
+
+# ⚙️ PARSING SERVICE - Process pool for CPU-bound parsing, thread fallback
+PARSER_WORKERS = int(os.getenv('PARSER_WORKERS', str(min(2, os.cpu_count() or 1))))  # 0 = threads only
+PARSER_MAX_PENDING = int(os.getenv('PARSER_MAX_PENDING', '32'))
+
+class ParsingService:
+    """Runs parsers in worker processes so they don't hold the GIL on the gateway loop"""
+    
+    def __init__(self, max_workers, max_pending):
+        self.max_workers = max_workers
+        self.executor = None
+        self.slots = asyncio.Semaphore(max_pending)  # bounded queue depth
+        self.stats = {'process': 0, 'thread': 0, 'broken': 0}
+    
+    def start(self):
+        if self.executor is not None or self.max_workers <= 0:
+            return
+        
+        try:
+            # Never fork the running bot: its threads (keep-alive, to_thread, stdout) may hold locks
+            if 'forkserver' in multiprocessing.get_all_start_methods():
+                mp_context = multiprocessing.get_context('forkserver')
+                mp_context.set_forkserver_preload(['parsing_workers'])
+            else:
+                mp_context = multiprocessing.get_context('spawn')
+            self.executor = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=mp_context)
+            print(f"⚙️ Parser pool: {self.max_workers} processes")
+        except Exception as e:
+            print(f"⚠️ Parser pool unavailable, using threads: {e}")
+            self.executor = None
+    
+    async def run(self, func, *args):
+        """Run func(*args) in the pool; falls back to a thread if the pool is missing or broken"""
+        async with self.slots:
+            if self.executor is not None:
+                try:
+                    result = await asyncio.get_running_loop().run_in_executor(self.executor, func, *args)
+                    self.stats['process'] += 1
+                    return result
+                except BrokenProcessPool as e:
+                    print(f"⚠️ Parser pool broken, falling back to threads: {e}")
+                    self.stats['broken'] += 1
+                    self.executor = None
+            
+            self.stats['thread'] += 1
+            return await asyncio.to_thread(func, *args)
+    
+    def shutdown(self):
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
+
+parsing_service = ParsingService(PARSER_WORKERS, PARSER_MAX_PENDING)
+
 # 🚀 ASYNC CONTENT EXTRACTION - Non-blocking
-async def extract_content_enhanced(url, source_name, news_item=None):
+async def extract_content_enhanced(url, source_name, news_item=None, priority=None):
+    """Cached content extraction - repeated and follow-up reads are served from cache"""
+    cached_content = await content_cache.get(url)
+    if cached_content is not None:
+        print(f"💾 Content cache hit: {url}")
+        return cached_content
+    
+    return await extract_flight.do(
+        extract_flight.key_for(normalize_article_url(url), priority),
+        lambda: extract_and_cache_content(url, source_name, news_item, priority)
+    )
+
+async def extract_and_cache_content(url, source_name, news_item=None, priority=None):
+    """Extract once and store successful results in the content cache"""
+    content = await extract_content_uncached(url, source_name, news_item, priority)
+    
+    if content and not isinstance(content, FallbackContent):
+        await content_cache.set(url, content)
+        search_index.add_content(url, content)
+    
+    return content
+
+async def extract_content_uncached(url, source_name, news_item=None, priority=None):
     """Enhanced content extraction - Gemini for international, traditional for domestic"""
     
     # For international sources, use Gemini
     if is_international_source(source_name):
         print(f"🤖 Using Gemini for international source: {source_name}")
-        return await extract_content_with_gemini(url, source_name)
+        return await extract_content_with_gemini(url, source_name, priority)
     
     # For domestic (CafeF) sources, use traditional async methods
     try:
@@ -482,111 +1029,16 @@ async def extract_content_enhanced(url, source_name, news_item=None):
         content = await fetch_with_aiohttp(url)
         
         if content:
-            # Method 1: Trafilatura with enhanced config for full content
-            if TRAFILATURA_AVAILABLE:
-                try:
-                    result = await asyncio.to_thread(
-                        trafilatura.bare_extraction,
-                        content,
-                        include_comments=False,
-                        include_tables=True,
-                        include_links=False,
-                        include_images=False,
-                        favor_precision=False,  # Changed to False for more content
-                        favor_recall=True,      # Added for maximum content
-                        with_metadata=True,
-                        prune_xpath=[],         # Don't prune anything
-                        only_with_metadata=False
-                    )
-                    
-                    if result and result.get('text') and len(result['text']) > 200:
-                        full_text = result['text']
-                        
-                        # Try to get more content with different settings
-                        if len(full_text) < 1000:
-                            result2 = await asyncio.to_thread(
-                                trafilatura.extract,
-                                content,
-                                include_comments=True,
-                                include_tables=True,
-                                include_links=True,
-                                favor_precision=False,
-                                favor_recall=True
-                            )
-                            if result2 and len(result2) > len(full_text):
-                                full_text = result2
-                        
-                        return full_text.strip()
-                except Exception as e:
-                    print(f"⚠️ Trafilatura failed: {e}")
-            
-            # Method 2: Enhanced BeautifulSoup with multiple strategies
-            if BEAUTIFULSOUP_AVAILABLE:
-                try:
-                    soup = await asyncio.to_thread(BeautifulSoup, content, 'html.parser')
-                    
-                    # Strategy 1: CafeF specific selectors
-                    content_selectors = [
-                        'div.detail-content',
-                        'div.fck_detail', 
-                        'div.content-detail',
-                        'div.article-content',
-                        'div.entry-content',
-                        'div.post-content',
-                        'article',
-                        'main',
-                        '.article-body',
-                        '.content-body',
-                        '.post-body'
-                    ]
-                    
-                    extracted_text = ""
-                    for selector in content_selectors:
-                        elements = soup.select(selector)
-                        if elements:
-                            for element in elements:
-                                text = element.get_text(strip=True)
-                                if len(text) > len(extracted_text):
-                                    extracted_text = text
-                    
-                    # Strategy 2: Find all paragraphs and combine
-                    if len(extracted_text) < 500:
-                        all_paragraphs = soup.find_all('p')
-                        paragraph_texts = []
-                        for p in all_paragraphs:
-                            p_text = p.get_text(strip=True)
-                            if len(p_text) > 50:  # Only substantial paragraphs
-                                paragraph_texts.append(p_text)
-                        
-                        combined_text = '\n\n'.join(paragraph_texts)
-                        if len(combined_text) > len(extracted_text):
-                            extracted_text = combined_text
-                    
-                    if extracted_text and len(extracted_text) > 300:
-                        cleaned_content = clean_content_enhanced(extracted_text)
-                        return cleaned_content.strip()
-                        
-                except Exception as e:
-                    print(f"⚠️ BeautifulSoup failed: {e}")
+            # Methods 1-2: Trafilatura, then BeautifulSoup - CPU-bound, run in the parser pool
+            extracted_text = await parsing_service.run(extract_article_text, content)
+            if extracted_text:
+                return extracted_text
             
-            # Method 3: Newspaper3k fallback
+            # Method 3: Newspaper3k fallback - parses the bytes we already have, off-loop
             if NEWSPAPER_AVAILABLE:
-                try:
-                    from newspaper import Article
-                    article = Article(url)
-                    article.set_config({
-                        'headers': get_enhanced_headers(url),
-                        'timeout': 12
-                    })
-                    
-                    article.download()
-                    article.parse()
-                    
-                    if article.text and len(article.text) > 300:
-                        return article.text.strip()
-                
-                except Exception as e:
-                    print(f"⚠️ Newspaper3k failed: {e}")
+                newspaper_text = await parsing_service.run(extract_with_newspaper, url, content)
+                if newspaper_text:
+                    return newspaper_text
         
         print(f"⚠️ All traditional methods failed for {source_name}")
         return create_fallback_content(url, source_name, "Traditional extraction methods failed")
@@ -595,158 +1047,922 @@ async def extract_content_enhanced(url, source_name, news_item=None):
         print(f"❌ Extract content error for {source_name}: {e}")
         return create_fallback_content(url, source_name, str(e))
 
-def clean_content_enhanced(content):
-    """Enhanced content cleaning for CafeF"""
-    if not content:
-        return content
+# 🔀 NEWS MERGE - Newest-first across sources, duplicates dropped
+def merge_news_streams(streams, use_global_dedup=False, counts=None, collapse_stories=False):
+    """Lazily k-way merge newest-first per-source streams, dropping duplicates as they surface
+    
+    With collapse_stories, only the newest article of each clustered story is yielded.
+    """
+    seen_index = DedupIndex()
+    shown_stories = set()
+    near_index = MinHashIndex(NEAR_DUP_THRESHOLD) if NEAR_DUP_THRESHOLD <= 1 else None
+    if counts is None:
+        counts = {'processed': 0, 'local': 0, 'near': 0, 'global': 0}
+    counts.setdefault('story', 0)
+    
+    for news_item in heapq.merge(*streams, key=attrgetter('published_ts'), reverse=True):
+        counts['processed'] += 1
+        
+        # Local duplicate check (exact title/link match within current collection)
+        if is_duplicate_article_local(news_item, seen_index):
+            counts['local'] += 1
+            continue
+        
+        # Near-duplicate check (same story reworded across feeds)
+        if near_index is not None:
+            signature = article_minhash(news_item)
+            if near_index.find(signature) is not None:
+                counts['near'] += 1
+                continue
+        
+        # Global duplicate check (exact title/link match cross-session) - only if enabled
+        if use_global_dedup and is_duplicate_article_global(news_item, news_item.source):
+            counts['global'] += 1
+            print(f"🌍 Global duplicate: {news_item.title[:50]}...")
+            continue
+        
+        seen_index.add(*get_dedup_keys(news_item), news_item.title)
+        if near_index is not None:
+            near_index.add(news_item, signature)
+        
+        # Related coverage of a story already listed
+        if collapse_stories:
+            story = story_clusterer.story_of(news_item)
+            if story is not None:
+                if story.id in shown_stories:
+                    counts['story'] += 1
+                    continue
+                shown_stories.add(story.id)
+        
+        yield news_item
+
+# 🗂️ ARTICLE STORE - Shared results refreshed by the background poller
+class ArticleStore:
+    """Latest articles per source, versioned so timeline snapshots can be reused"""
     
-    unwanted_patterns = [
-        r'Theo.*?CafeF.*?',
-        r'Nguồn.*?:.*?',
-        r'Tags:.*?$',
-        r'Từ khóa:.*?$',
-        r'Đăng ký.*?nhận tin.*?',
-        r'Like.*?Fanpage.*?',
-        r'Follow.*?us.*?'
-    ]
+    def __init__(self):
+        self.sources = {}  # source_name -> {'news', 'version'}
+        self.version = 0
+    
+    def update_source(self, source_name, news_items):
+        """Replace the articles for one source and bump its version; False if unchanged"""
+        entry = self.sources.get(source_name)
+        if entry and entry['news'] is news_items:
+            # Unchanged (e.g. 304 Not Modified) - keep version so snapshots stay valid
+            return False
+        
+        self.version += 1
+        self.sources[source_name] = {
+            'news': news_items,
+            'version': self.version
+        }
+        return True
     
-    for pattern in unwanted_patterns:
-        content = re.sub(pattern, '', content, flags=re.IGNORECASE | re.DOTALL)
+    def streams(self, sources_dict, limit_per_source=15):
+        """Per-source newest-first streams, the versions they were read at, and their total size"""
+        names = tuple(name for name in sources_dict if name in self.sources)
+        versions = tuple((name, self.sources[name]['version']) for name in names)
+        lists = [self.sources[name]['news'] for name in names]
+        streams = [islice(news, limit_per_source) for news in lists]
+        upper_bound = sum(min(len(news), limit_per_source) for news in lists)
+        return versions, streams, upper_bound
+    
+    def missing_sources(self, sources_dict):
+        """Sources that have never been fetched into the store"""
+        return {name: url for name, url in sources_dict.items() if name not in self.sources}
+
+article_store = ArticleStore()
+
+# 🗄️ ARTICLE DATABASE - SQLite (WAL) copy of the store for warm restarts
+ARTICLE_DB_PATH = os.getenv('ARTICLE_DB', CONTENT_CACHE_DB)  # empty = no persistence
+SEEN_SAVE_INTERVAL = int(os.getenv('SEEN_SAVE_INTERVAL', '300'))  # 0 = save on shutdown only
+
+def title_hash(title_key):
+    """Signed 64-bit hash of a normalized title, for the SQLite index"""
+    return int.from_bytes(hashlib.blake2b(title_key.encode('utf-8'), digest_size=8).digest(), 'big', signed=True)
+
+class ArticleDatabase:
+    """Collected articles, feed validators and global dedup state on disk
+    
+    Shares the SQLite file with the content caches; all access runs in a worker
+    thread under a lock, like ContentCache.
+    """
+    
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self.stats = {'saves': 0, 'loaded': 0, 'load_ms': 0}
+        self.autosave = None
+        self._db = None
+        self._db_lock = threading.Lock()
+    
+    def _connect(self):
+        if self._db is None:
+            self._db = sqlite3.connect(self.db_path, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.executescript("""
+                CREATE TABLE IF NOT EXISTS articles (
+                    source TEXT NOT NULL,
+                    link TEXT NOT NULL,
+                    title TEXT NOT NULL,
+                    description TEXT NOT NULL,
+                    published_ts INTEGER NOT NULL,
+                    title_hash INTEGER NOT NULL,
+                    saved_at REAL NOT NULL,
+                    entry_id TEXT,
+                    entry_ts INTEGER,
+                    PRIMARY KEY (source, link)
+                );
+                CREATE INDEX IF NOT EXISTS idx_articles_published ON articles(published_ts);
+                CREATE INDEX IF NOT EXISTS idx_articles_source ON articles(source);
+                CREATE INDEX IF NOT EXISTS idx_articles_title_hash ON articles(title_hash);
+                
+                CREATE TABLE IF NOT EXISTS feeds (
+                    rss_url TEXT PRIMARY KEY,
+                    source TEXT NOT NULL,
+                    etag TEXT,
+                    last_modified TEXT,
+                    limit_per_source INTEGER,
+                    saved_at REAL NOT NULL
+                );
+                
+                CREATE TABLE IF NOT EXISTS seen_articles (
+                    source TEXT NOT NULL,
+                    link TEXT NOT NULL,
+                    title TEXT NOT NULL,
+                    published_ts INTEGER NOT NULL,
+                    title_hash INTEGER NOT NULL,
+                    expires_at REAL NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_seen_title_hash ON seen_articles(title_hash);
+            """)
+            # Feed entry keys were added later - upgrade older database files in place
+            columns = {row[1] for row in self._db.execute("PRAGMA table_info(articles)")}
+            for column, column_type in (('entry_id', 'TEXT'), ('entry_ts', 'INTEGER')):
+                if column not in columns:
+                    self._db.execute(f"ALTER TABLE articles ADD COLUMN {column} {column_type}")
+            self._db.commit()
+        return self._db
+    
+    def _save_source(self, source_name, rss_url, news_items, state):
+        now = time.time()
+        # Feed entry key of each article, so the next start can skip rebuilding it
+        entry_keys = {id(news): key for key, news in state['entries'].items() if news is not None} if state else {}
+        rows = [
+            (news.source, news.link, news.title, news.description, news.published_ts, title_hash(news.title_key), now)
+            + entry_keys.get(id(news), (None, None))
+            for news in news_items
+        ]
+        with self._db_lock:
+            db = self._connect()
+            db.execute("DELETE FROM articles WHERE source = ?", (source_name,))
+            db.executemany(
+                "INSERT OR REPLACE INTO articles "
+                "(source, link, title, description, published_ts, title_hash, saved_at, entry_id, entry_ts) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                rows
+            )
+            if state:
+                db.execute(
+                    "INSERT OR REPLACE INTO feeds VALUES (?, ?, ?, ?, ?, ?)",
+                    (rss_url, source_name, state['etag'], state['last_modified'], state['limit'], now)
+                )
+            db.commit()
+    
+    def _save_seen(self, remaining):
+        now = time.time()
+        rows = [
+            (news.source, news.link, news.title, news.published_ts, title_hash(news.title_key), now + seconds_left)
+            for news, seconds_left in remaining
+        ]
+        with self._db_lock:
+            db = self._connect()
+            db.execute("DELETE FROM seen_articles")
+            db.executemany("INSERT INTO seen_articles VALUES (?, ?, ?, ?, ?, ?)", rows)
+            db.commit()
+    
+    def _load(self):
+        with self._db_lock:
+            db = self._connect()
+            articles = db.execute(
+                "SELECT source, link, title, description, published_ts, entry_id, entry_ts "
+                "FROM articles ORDER BY source, published_ts DESC"
+            ).fetchall()
+            feeds = db.execute("SELECT rss_url, etag, last_modified, limit_per_source FROM feeds").fetchall()
+            seen = db.execute(
+                "SELECT source, link, title, published_ts, expires_at FROM seen_articles WHERE expires_at > ? ORDER BY expires_at",
+                (time.time(),)
+            ).fetchall()
+        return articles, feeds, seen
+    
+    # --- public API ---
+    async def save_source(self, source_name, rss_url, news_items, state=None):
+        if not self.db_path:
+            return
+        try:
+            await asyncio.to_thread(self._save_source, source_name, rss_url, news_items, state)
+            self.stats['saves'] += 1
+        except Exception as e:
+            print(f"⚠️ Article DB write error: {e}")
     
-    content = re.sub(r'\s+', ' ', content)
-    content = re.sub(r'\n\s*\n', '\n', content)
+    async def save_seen(self, seen_cache):
+        if not self.db_path:
+            return
+        try:
+            await asyncio.to_thread(self._save_seen, seen_cache.remaining())
+        except Exception as e:
+            print(f"⚠️ Article DB write error: {e}")
     
-    return content.strip()
+    async def warm_start(self, store, seen_cache):
+        """Fill the article store, feed validators and dedup cache from disk"""
+        if not self.db_path:
+            return 0
+        
+        started = time.perf_counter()
+        try:
+            articles, feeds, seen = await asyncio.to_thread(self._load)
+        except Exception as e:
+            print(f"⚠️ Article DB read error: {e}")
+            return 0
+        
+        by_source = {}
+        entries_by_source = {}
+        for source_name, link, title, description, published_ts, entry_id, entry_ts in articles:
+            news = NewsArticle(title, link, source_name, published_ts, description)
+            by_source.setdefault(source_name, []).append(news)
+            if entry_id is not None:
+                entries_by_source.setdefault(source_name, {})[(entry_id, entry_ts)] = news
+        
+        source_urls = {name: url for feeds_dict in RSS_FEEDS.values() for name, url in feeds_dict.items()}
+        feed_rows = {row[0]: row[1:] for row in feeds}
+        
+        for source_name, news_items in by_source.items():
+            rss_url = source_urls.get(source_name)
+            if rss_url is None:
+                continue
+            store.update_source(source_name, news_items)
+            for news in news_items:
+                search_index.add(news)
+                near_duplicate_index.add(news)
+                story_clusterer.add(news)
+            
+            # The first poll after a restart reuses these instead of treating every entry as new
+            state = get_feed_http_state(rss_url)
+            state['entries'] = entries_by_source.get(source_name, {})
+            
+            # Validators only make sense together with the articles they describe
+            if rss_url in feed_rows:
+                etag, last_modified, limit_per_source = feed_rows[rss_url]
+                state.update(etag=etag, last_modified=last_modified, limit=limit_per_source, news=news_items)
+        
+        now = time.time()
+        for source_name, link, title, published_ts, expires_at in seen:
+            seen_cache.add(NewsArticle(title, link, source_name, published_ts), expires_at - now)
+        
+        loaded = sum(len(news_items) for news_items in by_source.values())
+        self.stats['loaded'] = loaded
+        self.stats['load_ms'] = (time.perf_counter() - started) * 1000
+        print(f"🗄️ Warm start: {loaded} articles from {len(by_source)} sources, {len(seen)} seen in {self.stats['load_ms']:.0f}ms")
+        return loaded
+    
+    def start_autosave(self, seen_cache, interval):
+        """Snapshot the dedup cache periodically - close() is not reached when the host kills the process"""
+        if not self.db_path or interval <= 0 or (self.autosave and not self.autosave.done()):
+            return
+        self.autosave = asyncio.create_task(self._autosave_loop(seen_cache, interval))
+    
+    async def _autosave_loop(self, seen_cache, interval):
+        while True:
+            await asyncio.sleep(interval)
+            await self.save_seen(seen_cache)
+    
+    async def stop_autosave(self):
+        if self.autosave:
+            self.autosave.cancel()
+            await asyncio.gather(self.autosave, return_exceptions=True)
+            self.autosave = None
+    
+    def close(self):
+        with self._db_lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+article_db = ArticleDatabase(ARTICLE_DB_PATH)
+
+# 🔎 SEARCH INDEX - Incremental inverted index, diacritic-insensitive
+SEARCH_MAX_DOCS = int(os.getenv('SEARCH_MAX_DOCS', '10000'))
+SEARCH_RESULT_LIMIT = 12  # One listing page
+SEARCH_RANK_WINDOW = 8  # Candidates ranked per result slot
+SEARCH_CONTENT_CHARS = 20000  # Only the start of long extracted articles is indexed
+_SEARCH_TOKEN_RE = re.compile(r'\w+')
+_COMBINING_MARKS_RE = re.compile(r'[\u0300-\u036f]')
+_VIETNAMESE_D = str.maketrans({'đ': 'd', 'Đ': 'd'})
+
+def fold_vietnamese(text):
+    """Lowercase and strip diacritics: 'Đồng Việt' -> 'dong viet'"""
+    decomposed = unicodedata.normalize('NFD', text.translate(_VIETNAMESE_D).lower())
+    return _COMBINING_MARKS_RE.sub('', decomposed)
+
+def search_tokens(text):
+    return {
+        token for token in _SEARCH_TOKEN_RE.findall(fold_vietnamese(text))
+        if len(token) > 1 or token.isdigit()
+    }
 
-# 🚀 ASYNC NEWS COLLECTION - Fully non-blocking
-async def collect_news_enhanced(sources_dict, limit_per_source=15, use_global_dedup=False):
-    """Session-based collection with EXACT TITLE duplicate detection"""
-    all_news = []
+class SearchIndex:
+    """Token -> article postings over titles, descriptions and extracted content
+    
+    Articles are keyed by normalized link, indexed once when ingested and again
+    only when their extracted content arrives. Oldest documents are evicted
+    past max_docs.
+    """
+    
+    def __init__(self, max_docs):
+        self.max_docs = max_docs
+        self.postings = {}  # token -> set of doc ids
+        self.docs = OrderedDict()  # doc id -> [article, interned tokens (tuple, for eviction)]
+        self.doc_ids = {}  # link key -> doc id
+        self._next_id = itertools.count()
+    
+    def __len__(self):
+        return len(self.docs)
+    
+    def _index_tokens(self, doc_id, tokens):
+        for token in tokens:
+            doc_set = self.postings.get(token)
+            if doc_set is None:
+                self.postings[token] = {doc_id}
+            else:
+                doc_set.add(doc_id)
+    
+    def _remove(self, doc_id):
+        article, tokens = self.docs.pop(doc_id)
+        self.doc_ids.pop(article.link_key, None)
+        for token in tokens:
+            doc_set = self.postings.get(token)
+            if doc_set is not None:
+                doc_set.discard(doc_id)
+                if not doc_set:
+                    del self.postings[token]
+    
+    def add(self, article):
+        doc_id = self.doc_ids.get(article.link_key)
+        if doc_id is not None:
+            indexed = self.docs[doc_id][0]
+            if indexed.title == article.title and indexed.description == article.description:
+                # Same text - just point at the newest record
+                self.docs[doc_id][0] = article
+                return
+            # Edited title/description: the old postings no longer describe it
+            self._remove(doc_id)
+        
+        # Interned, so every document shares the token strings held by the postings
+        tokens = tuple(map(sys.intern, search_tokens(article.title) | search_tokens(article.description)))
+        
+        doc_id = next(self._next_id)
+        self.docs[doc_id] = [article, tokens]
+        self.doc_ids[article.link_key] = doc_id
+        self._index_tokens(doc_id, tokens)
+        
+        while len(self.docs) > self.max_docs:
+            self._remove(next(iter(self.docs)))
     
-    print(f"🔄 Starting collection from {len(sources_dict)} sources (Global dedup: {use_global_dedup})")
-    print(f"🎯 Duplicate logic: EXACT title match only")
+    def add_content(self, url, content):
+        """Add extracted article text to an already indexed article"""
+        doc_id = self.doc_ids.get(normalize_link(url))
+        if doc_id is None:
+            return
+        
+        doc = self.docs[doc_id]
+        new_tokens = search_tokens(content[:SEARCH_CONTENT_CHARS]).difference(doc[1])
+        if new_tokens:
+            new_tokens = tuple(map(sys.intern, new_tokens))
+            doc[1] = doc[1] + new_tokens
+            self._index_tokens(doc_id, new_tokens)
+    
+    def search(self, query, limit=SEARCH_RESULT_LIMIT):
+        """Articles containing every query token; title matches and newer articles first"""
+        query_tokens = search_tokens(query)
+        if not query_tokens:
+            return []
+        
+        doc_sets = []
+        for token in query_tokens:
+            doc_set = self.postings.get(token)
+            if not doc_set:
+                return []
+            doc_sets.append(doc_set)
+        
+        # Intersect starting from the rarest token
+        doc_sets.sort(key=len)
+        matches = doc_sets[0].intersection(*doc_sets[1:])
+        
+        # Broad queries: only rank the most recently ingested matches (doc ids grow with ingestion)
+        if len(matches) > limit * SEARCH_RANK_WINDOW:
+            matches = heapq.nlargest(limit * SEARCH_RANK_WINDOW, matches)
+        
+        # Title tokens are recomputed for these few candidates instead of being stored per document
+        def rank(doc_id):
+            article = self.docs[doc_id][0]
+            return (len(query_tokens & search_tokens(article.title)), article.published_ts)
+        
+        return [self.docs[doc_id][0] for doc_id in heapq.nlargest(limit, matches, key=rank)]
+
+search_index = SearchIndex(SEARCH_MAX_DOCS)
+
+# 🧬 NEAR-DUPLICATE DETECTION - MinHash + LSH over title/description word sets
+NEAR_DUP_THRESHOLD = float(os.getenv('NEAR_DUP_THRESHOLD', '0.7'))  # Estimated Jaccard; above 1 disables
+NEAR_DUP_MAX_ENTRIES = int(os.getenv('NEAR_DUP_MAX_ENTRIES', '2000'))  # ~2.7 KB each incl. signature
+MINHASH_PERMUTATIONS = 64
+MINHASH_BANDS = 16  # 16 bands x 4 rows - pairs above ~0.5 similarity almost always share a band
+MINHASH_ROWS = MINHASH_PERMUTATIONS // MINHASH_BANDS
+MINHASH_DESCRIPTION_TOKENS = 20  # Lead of the description only - feeds append different boilerplate
+# Two salted 64-byte blake2b digests give 64 independent 16-bit hashes per token
+# (a chance 16-bit match is 1 in 65536 per permutation - far below the threshold's resolution)
+MINHASH_SALTS = [f"minhash{i}".encode() for i in range(MINHASH_PERMUTATIONS // 32)]
+MINHASH_TOKEN_CACHE_SIZE = 4096  # Recent words only - common news vocabulary stays hot
+_minhash_token_cache = OrderedDict()  # token -> 128-byte digest, least recently used first
+
+def near_dup_tokens(title, description=""):
+    """Folded word set of the title plus the start of the description"""
+    tokens = set(_SEARCH_TOKEN_RE.findall(fold_vietnamese(title)))
+    tokens.update(_SEARCH_TOKEN_RE.findall(fold_vietnamese(description))[:MINHASH_DESCRIPTION_TOKENS])
+    return tokens
+
+def _minhash_token_digest(token):
+    digest = _minhash_token_cache.get(token)
+    if digest is not None:
+        _minhash_token_cache.move_to_end(token)
+        return digest
+    
+    data = token.encode('utf-8')
+    digest = b''.join(hashlib.blake2b(data, digest_size=64, salt=salt).digest() for salt in MINHASH_SALTS)
+    _minhash_token_cache[token] = digest
+    if len(_minhash_token_cache) > MINHASH_TOKEN_CACHE_SIZE:
+        _minhash_token_cache.popitem(last=False)
+    return digest
+
+def minhash_signature(title, description=""):
+    """Per-permutation minimum of the token hashes, packed as 64 uint16 (128 bytes)
+    
+    None when there are no words: an all-zero signature would match every other
+    wordless article with similarity 1.0.
+    """
+    token_hashes = [memoryview(_minhash_token_digest(token)).cast('H')
+                    for token in near_dup_tokens(title, description)]
+    if not token_hashes:
+        return None
+    return array('H', map(min, zip(*token_hashes))).tobytes()
+
+def article_minhash(article):
+    """Signature over the title and the lead of the description - what merges compare"""
+    return minhash_signature(article.title, article.description)
+
+def title_minhash(article):
+    """Signature over the title alone - what !test_dup compares a typed title against"""
+    return minhash_signature(article.title)
+
+def minhash_similarity(first, second):
+    """Estimated Jaccard similarity of the two word sets"""
+    matches = sum(1 for a, b in zip(memoryview(first).cast('H'), memoryview(second).cast('H')) if a == b)
+    return matches / MINHASH_PERMUTATIONS
+
+class MinHashIndex:
+    """LSH over MinHash signatures - only articles sharing a band are compared
+    
+    Signatures live here, not on the shared article records, so they are freed
+    with the index (per merge) or bounded by max_entries.
+    """
+    
+    def __init__(self, threshold, max_entries=None, signature_func=article_minhash):
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.signature_func = signature_func
+        self.bands = [{} for _ in range(MINHASH_BANDS)]  # band rows -> [link key, ...] oldest first
+        self.entries = OrderedDict()  # link key -> (article, signature), oldest first
+    
+    def __len__(self):
+        return len(self.entries)
+    
+    @staticmethod
+    def _band_keys(signature):
+        width = MINHASH_ROWS * 2
+        return [signature[band * width:(band + 1) * width] for band in range(MINHASH_BANDS)]
+    
+    def candidates(self, signature):
+        """(article, signature) of every entry sharing at least one band"""
+        found = {}
+        for band, key in zip(self.bands, self._band_keys(signature)):
+            for link_key in band.get(key, ()):
+                found[link_key] = self.entries[link_key]
+        return found.values()
+    
+    def find(self, signature):
+        """First indexed article at or above the threshold, or None"""
+        if signature is None:
+            return None
+        for article, indexed in self.candidates(signature):
+            if minhash_similarity(signature, indexed) >= self.threshold:
+                return article
+        return None
+    
+    def nearest(self, signature, limit=5):
+        """(similarity, article) for the most similar candidates, best first"""
+        if signature is None:
+            return []
+        scored = [(minhash_similarity(signature, indexed), article) for article, indexed in self.candidates(signature)]
+        return heapq.nlargest(limit, scored, key=lambda pair: pair[0])
+    
+    def add(self, article, signature=None):
+        """Index the article; pass the signature if it was already computed for a lookup"""
+        if article.link_key in self.entries:
+            return
+        if signature is None:
+            signature = self.signature_func(article)
+            if signature is None:
+                return
+        
+        self.entries[article.link_key] = (article, signature)
+        for band, key in zip(self.bands, self._band_keys(signature)):
+            band.setdefault(key, []).append(article.link_key)
+        
+        if self.max_entries is not None:
+            while len(self.entries) > self.max_entries:
+                self._pop_oldest()
+    
+    def _pop_oldest(self):
+        link_key, (_, signature) = self.entries.popitem(last=False)
+        for band, key in zip(self.bands, self._band_keys(signature)):
+            bucket = band.get(key)
+            if bucket is not None:
+                # Buckets fill in insertion order, so the oldest article sits at the front
+                bucket.remove(link_key)
+                if not bucket:
+                    del band[key]
+
+# Recently ingested articles, for !test_dup lookups only - keyed on titles, like the typed query
+near_duplicate_index = MinHashIndex(NEAR_DUP_THRESHOLD, NEAR_DUP_MAX_ENTRIES, title_minhash)
+
+# 🧵 STORY CLUSTERING - Related articles collapse into one listing entry
+STORY_SIMILARITY = float(os.getenv('STORY_SIMILARITY', '0.3'))  # Cosine to the story centroid
+STORY_WINDOW_HOURS = int(os.getenv('STORY_WINDOW_HOURS', '36'))  # Stories idle longer stop growing
+STORY_MAX_ACTIVE = int(os.getenv('STORY_MAX_ACTIVE', '4096'))
+STORY_FEATURES = 2048  # Hashed feature space (power of two)
+STORY_DESCRIPTION_TOKENS = 40
+
+class Story:
+    """Articles about one event, newest member first"""
+    __slots__ = ('id', 'members', 'row', 'updated')
+    
+    def __init__(self, story_id, row):
+        self.id = story_id
+        self.members = []
+        self.row = row  # Centroid row while the story is active, else None
+        self.updated = time.monotonic()
+
+class StoryClusterer:
+    """Incremental single-pass clustering on hashed TF-IDF vectors
+    
+    Each new article is vectorized once with the document frequencies seen so
+    far, compared against every active story centroid in one matrix product, and
+    either joins the closest story or starts a new one. Nothing is recomputed
+    for older articles; stories idle past the window are retired.
+    """
+    
+    def __init__(self, threshold, window_seconds, max_active):
+        self.threshold = threshold
+        self.window_seconds = window_seconds
+        self.max_active = max_active
+        self.enabled = NUMPY_AVAILABLE
+        self.stories_by_link = {}  # link key -> Story
+        self.active = []  # row -> Story
+        self.doc_count = 0
+        self.stats = {'articles': 0, 'joined': 0, 'stories': 0, 'retired': 0}
+        self._ids = itertools.count(1)
+        
+        if self.enabled:
+            self.doc_freq = np.zeros(STORY_FEATURES, dtype=np.float32)
+            self.sums = np.zeros((max_active, STORY_FEATURES), dtype=np.float32)  # Sum of member vectors
+            self.norms = np.zeros(max_active, dtype=np.float32)
+    
+    def _vectorize(self, article):
+        tokens = _SEARCH_TOKEN_RE.findall(fold_vietnamese(article.title))
+        tokens += _SEARCH_TOKEN_RE.findall(fold_vietnamese(article.description))[:STORY_DESCRIPTION_TOKENS]
+        if not tokens:
+            return None
+        
+        # Signed feature hashing: low bits pick the column, the top bit the sign
+        hashed = np.fromiter((zlib.crc32(token.encode('utf-8')) for token in tokens), dtype=np.uint32, count=len(tokens))
+        columns = (hashed & (STORY_FEATURES - 1)).astype(np.intp)
+        signs = np.where(hashed >> 31, -1.0, 1.0).astype(np.float32)
+        
+        unique_columns, inverse = np.unique(columns, return_inverse=True)
+        self.doc_freq[unique_columns] += 1
+        self.doc_count += 1
+        
+        counts = np.zeros(STORY_FEATURES, dtype=np.float32)
+        np.add.at(counts, columns, signs)
+        tf = np.sign(counts[unique_columns]) * (1 + np.log(np.maximum(np.abs(counts[unique_columns]), 1)))
+        idf = np.log((1 + self.doc_count) / (1 + self.doc_freq[unique_columns])) + 1
+        
+        vector = np.zeros(STORY_FEATURES, dtype=np.float32)
+        vector[unique_columns] = tf * idf
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else None
+    
+    def _retire_idle(self):
+        """Drop idle stories from the centroid matrix, oldest first if still full"""
+        cutoff = time.monotonic() - self.window_seconds
+        keep = [story for story in self.active if story.updated >= cutoff]
+        if len(keep) >= self.max_active:
+            keep.sort(key=lambda story: story.updated)
+            keep = keep[len(keep) - self.max_active // 2:]
+        
+        kept_rows = [story.row for story in keep]
+        kept_ids = {story.id for story in keep}
+        for story in self.active:
+            if story.id not in kept_ids:
+                story.row = None
+                for member in story.members:
+                    self.stories_by_link.pop(member.link_key, None)
+                self.stats['retired'] += 1
+        
+        count = len(keep)
+        self.sums[:count] = self.sums[kept_rows]
+        self.norms[:count] = self.norms[kept_rows]
+        self.sums[count:] = 0
+        self.norms[count:] = 0
+        for row, story in enumerate(keep):
+            story.row = row
+        self.active = keep
+    
+    def add(self, article):
+        """Assign one newly ingested article to a story"""
+        if not self.enabled or article.link_key in self.stories_by_link:
+            return
+        
+        vector = self._vectorize(article)
+        if vector is None:
+            return
+        self.stats['articles'] += 1
+        
+        story = None
+        count = len(self.active)
+        if count:
+            similarities = (self.sums[:count] @ vector) / np.maximum(self.norms[:count], 1e-9)
+            best = int(np.argmax(similarities))
+            if similarities[best] >= self.threshold:
+                story = self.active[best]
+                self.stats['joined'] += 1
+        
+        if story is None:
+            if count >= self.max_active:
+                self._retire_idle()
+                count = len(self.active)
+            story = Story(next(self._ids), count)
+            self.active.append(story)
+            self.stats['stories'] += 1
+        
+        self.sums[story.row] += vector
+        self.norms[story.row] = np.linalg.norm(self.sums[story.row])
+        story.updated = time.monotonic()
+        
+        # Keep members newest first
+        story.members.append(article)
+        story.members.sort(key=attrgetter('published_ts'), reverse=True)
+        self.stories_by_link[article.link_key] = story
+    
+    def story_of(self, article):
+        return self.stories_by_link.get(article.link_key)
+    
+    def related(self, article, limit=5):
+        """Other members of the article's story, newest first"""
+        story = self.story_of(article)
+        if story is None:
+            return []
+        return [member for member in story.members if member is not article][:limit]
+
+story_clusterer = StoryClusterer(STORY_SIMILARITY, STORY_WINDOW_HOURS * 3600, STORY_MAX_ACTIVE)
+
+# 🔁 BACKGROUND FEED POLLER - One task per feed, each on its own schedule
+FEED_POLL_INTERVALS = {
+    'domestic': int(os.getenv('FEED_POLL_DOMESTIC', '180')),
+    'international': int(os.getenv('FEED_POLL_INTERNATIONAL', '300'))
+}
+FEED_LIMITS = {'domestic': 15, 'international': 20}
+feed_poller_tasks: Dict[str, asyncio.Task] = {}
+
+async def refresh_source(source_name, source_url, limit_per_source):
+    """Fetch one source into the store; the poller and cold commands share one fetch"""
+    return await feed_flight.do(
+        (source_name, limit_per_source),
+        lambda: refresh_source_uncoalesced(source_name, source_url, limit_per_source)
+    )
+
+async def refresh_source_uncoalesced(source_name, source_url, limit_per_source):
+    """Fetch one source and publish the result into the article store"""
+    news_items = await process_single_source(source_name, source_url, limit_per_source)
     
-    # Clean expired cache before starting
-    if use_global_dedup:
-        clean_expired_cache()
+    # Failed fetch/parse - keep serving the last good articles (memory and disk)
+    if news_items is None:
+        if source_name not in article_store.sources:
+            # Mark as attempted so commands don't refetch it inline every time
+            article_store.update_source(source_name, [])
+        return None
     
-    # Create tasks for concurrent processing
-    tasks = []
-    for source_name, source_url in sources_dict.items():
-        task = process_single_source(source_name, source_url, limit_per_source)
-        tasks.append(task)
+    changed = article_store.update_source(source_name, news_items)
     
-    # Process all sources concurrently
-    results = await asyncio.gather(*tasks, return_exceptions=True)
+    if changed:
+        await article_db.save_source(source_name, source_url, news_items, feed_http_cache.get(source_url))
     
-    # Collect results with exact title duplicate detection
-    total_processed = 0
-    local_duplicates = 0
-    global_duplicates = 0
+    # New international entries - pre-translate the freshest ones in the background
+    if changed and source_name in RSS_FEEDS['international']:
+        precompute_pipeline.offer_latest()
     
-    for result in results:
-        if isinstance(result, Exception):
-            print(f"❌ Source processing error: {result}")
-        elif result:
-            for news_item in result:
-                total_processed += 1
-                
-                # Local duplicate check (exact title/link match within current collection)
-                if is_duplicate_article_local(news_item, all_news):
-                    local_duplicates += 1
-                    print(f"🔄 Local duplicate: {news_item['title'][:50]}...")
-                    continue
-                
-                # Global duplicate check (exact title/link match cross-session) - only if enabled
-                if use_global_dedup and is_duplicate_article_global(news_item, news_item['source']):
-                    global_duplicates += 1
-                    print(f"🌍 Global duplicate: {news_item['title'][:50]}...")
-                    continue
-                
-                # Add unique article
-                all_news.append(news_item)
+    return news_items
+
+async def feed_poller_loop(source_name, source_url, limit_per_source, interval):
+    """Keep a single feed fresh in the article store"""
+    # Stagger the first poll so feeds don't all fire at once
+    await asyncio.sleep(random.uniform(0, 5))
     
-    unique_count = len(all_news)
-    print(f"📊 Processed: {total_processed}, Local dups: {local_duplicates}, Global dups: {global_duplicates}, Unique: {unique_count}")
+    while True:
+        try:
+            await refresh_source(source_name, source_url, limit_per_source)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"❌ Poller error for {source_name}: {e}")
+        
+        await asyncio.sleep(interval + random.uniform(-10, 10))
+
+def start_feed_pollers():
+    """Start one poller task per configured feed"""
+    for category, feeds in RSS_FEEDS.items():
+        for source_name, source_url in feeds.items():
+            task = feed_poller_tasks.get(source_name)
+            if task and not task.done():
+                continue
+            feed_poller_tasks[source_name] = asyncio.create_task(
+                feed_poller_loop(source_name, source_url, FEED_LIMITS[category], FEED_POLL_INTERVALS[category])
+            )
     
-    # Sort by publish time
-    all_news.sort(key=lambda x: x['published'], reverse=True)
-    return all_news
+    print(f"🔁 Feed pollers running: {len(feed_poller_tasks)}")
+
+async def stop_feed_pollers():
+    """Cancel all poller tasks"""
+    tasks = list(feed_poller_tasks.values())
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    feed_poller_tasks.clear()
+
+async def ensure_sources_loaded(sources_dict, limit_per_source=15):
+    """Fetch never-fetched sources inline; everything else is kept fresh by the poller"""
+    missing = article_store.missing_sources(sources_dict)
+    
+    if missing:
+        print(f"🔄 Store cold for {len(missing)} sources, fetching inline")
+        await asyncio.gather(
+            *(refresh_source(name, url, limit_per_source) for name, url in missing.items()),
+            return_exceptions=True
+        )
 
 async def process_single_source(source_name, source_url, limit_per_source):
-    """Process a single RSS source asynchronously"""
+    """Process a single RSS source asynchronously; None if it could not be fetched or parsed"""
     try:
         print(f"🔄 Processing {source_name}: {source_url}")
         
-        if source_url.endswith('.rss') or 'rss' in source_url.lower() or 'feeds.' in source_url:
+        # Covers every configured feed: .rss, /rss/, feeds*.host, /feed, feed.xml, feedbuilder
+        source_url_lower = source_url.lower()
+        if 'rss' in source_url_lower or 'feed' in source_url_lower:
             # RSS Feed processing
             return await process_rss_feed_async(source_name, source_url, limit_per_source)
         else:
             # For future expansion - direct scraping
-            return []
+            return None
             
     except Exception as e:
         print(f"❌ Error for {source_name}: {e}")
-        return []
+        return None
 
 async def process_rss_feed_async(source_name, rss_url, limit_per_source):
     """FIXED: Async RSS feed processing to prevent blocking"""
     try:
         await async_sleep_delay()
         
-        # Use aiohttp instead of requests
-        content = await fetch_with_aiohttp(rss_url)
+        state = get_feed_http_state(rss_url)
+        if state['limit'] != limit_per_source:
+            state['news'] = None
+        
+        # Conditional GET - unchanged feeds skip download and parsing entirely
+        status, content, validators = await fetch_feed_conditional(rss_url, state)
+        
+        if status == 304 and state['news'] is not None:
+            state['hits'] += 1
+            state['new'] = 0
+            state['reused'] = len(state['news'])
+            print(f"📡 {source_name} not modified (304)")
+            return state['news']
         
         if content:
-            # Parse feedparser in thread to avoid blocking
-            feed = await asyncio.to_thread(feedparser.parse, content)
+            state['misses'] += 1
+            # Parse in the parser pool to keep the event loop free
+            entries = await parsing_service.run(parse_feed_entries, content, limit_per_source)
         else:
-            # Fallback to direct feedparser
-            feed = await asyncio.to_thread(feedparser.parse, rss_url)
+            state['errors'] += 1
+            # Fallback to direct feedparser (network fetch - stays on a thread)
+            entries = await asyncio.to_thread(parse_feed_entries, rss_url, limit_per_source)
         
-        if not feed or not hasattr(feed, 'entries') or len(feed.entries) == 0:
-            return []
+        # Nothing parsed (download and fallback both failed) - report failure, not an empty feed
+        if not entries:
+            return None
         
+        # Incremental ingestion - entries seen on a previous poll are reused as-is
+        previous_entries = state['entries']
+        current_entries = {}
         news_items = []
-        for entry in feed.entries[:limit_per_source]:
-            try:
-                vn_time = get_current_vietnam_datetime()
-                
-                if hasattr(entry, 'published_parsed') and entry.published_parsed:
-                    vn_time = convert_utc_to_vietnam_time(entry.published_parsed)
-                elif hasattr(entry, 'updated_parsed') and entry.updated_parsed:
-                    vn_time = convert_utc_to_vietnam_time(entry.updated_parsed)
-                
-                description = ""
-                if hasattr(entry, 'summary'):
-                    description = entry.summary[:400] + "..." if len(entry.summary) > 400 else entry.summary
-                elif hasattr(entry, 'description'):
-                    description = entry.description[:400] + "..." if len(entry.description) > 400 else entry.description
-                
-                if hasattr(entry, 'title') and hasattr(entry, 'link'):
-                    title = entry.title.strip()
-                    
-                    # Filter for relevant economic/financial content
-                    if is_relevant_news(title, description, source_name):
-                        news_item = {
-                            'title': html.unescape(title),
-                            'link': entry.link,
-                            'source': source_name,
-                            'published': vn_time,
-                            'published_str': vn_time.strftime("%H:%M %d/%m"),
-                            'description': html.unescape(description) if description else ""
-                        }
-                        news_items.append(news_item)
-                
-            except Exception as entry_error:
-                continue
+        new_count = 0
+        reused_count = 0
+        
+        for entry in entries:
+            entry_key = feed_entry_key(entry)
+            
+            if entry_key in previous_entries:
+                news_item = previous_entries[entry_key]
+                reused_count += 1
+            else:
+                news_item = build_news_item(entry, source_name)
+                new_count += 1
+                if news_item is not None:
+                    search_index.add(news_item)
+                    near_duplicate_index.add(news_item)
+                    story_clusterer.add(news_item)
+            
+            current_entries[entry_key] = news_item
+            if news_item is not None:
+                news_items.append(news_item)
+        
+        # Keep each source newest-first so merges can stream through it
+        news_items.sort(key=attrgetter('published_ts'), reverse=True)
+        
+        state['entries'] = current_entries
+        state['new'] = new_count
+        state['reused'] = reused_count
+        state['total_new'] += new_count
+        state['total_reused'] += reused_count
+        
+        # Same articles (server without validators) - hand back the previous list so the store stays unchanged
+        if state['news'] is not None and state['news'] == news_items:
+            news_items = state['news']
         
-        print(f"✅ Processed {len(news_items)} articles from {source_name}")
+        # Remember the parsed result so a later 304 can reuse it - validators only go with it
+        if content:
+            state['news'] = news_items
+            state['limit'] = limit_per_source
+            state['etag'], state['last_modified'] = validators
+        
+        print(f"✅ Processed {len(news_items)} articles from {source_name} (new {new_count}, reused {reused_count})")
         return news_items
         
     except Exception as e:
         print(f"❌ RSS processing error for {source_name}: {e}")
-        return []
+        return None
+
+def feed_entry_key(entry):
+    """(guid or link, epoch seconds) - plain values so the article DB can restore it"""
+    time_tuple = entry['time_tuple']
+    return (entry['guid'] or entry['link'], calendar.timegm(time_tuple) if time_tuple else None)
+
+def build_news_item(entry, source_name):
+    """Normalize one parsed feed entry into a news item; None if unusable or irrelevant"""
+    try:
+        # Epoch seconds; entries without a date are stamped with the ingest time
+        published_ts = calendar.timegm(entry['time_tuple']) if entry['time_tuple'] else time.time()
+        
+        description = entry['summary'] or ""
+        if len(description) > 400:
+            description = description[:400] + "..."
+        
+        if entry['title'] is None or entry['link'] is None:
+            return None
+        
+        title = entry['title'].strip()
+        
+        # Filter for relevant economic/financial content
+        if not is_relevant_news(title, description, source_name):
+            return None
+        
+        return NewsArticle(
+            html.unescape(title),
+            entry['link'],
+            source_name,
+            published_ts,
+            html.unescape(description) if description else ""
+        )
+    except Exception as entry_error:
+        return None
 
 def is_relevant_news(title, description, source_name):
     """Filter for relevant economic/financial news - MORE RELAXED"""
@@ -775,56 +1991,131 @@ def is_relevant_news(title, description, source_name):
     # If no keywords found, still include (very relaxed)
     return True  # Changed from False to True - accept all articles
 
-def get_or_collect_user_news(user_id, command_type, sources_dict, limit_per_source=15):
-    """Get cached news or collect new ones for consistent pagination"""
-    global user_news_cache
-    
-    # Check if user has recent cached news for this command
-    if user_id in user_news_cache:
-        cached_data = user_news_cache[user_id]
-        time_diff = get_current_vietnam_datetime() - cached_data['timestamp']
+# 🧭 SHARED TIMELINE - Immutable snapshots shared by all users, one small cursor per user
+ITEMS_PER_PAGE = 12
+MAX_USER_CURSORS = int(os.getenv('MAX_USER_CURSORS', '10000'))
+CURSOR_STABLE_SECONDS = 600  # Keep paging one snapshot for up to 10 minutes
+TIMELINE_GROUPS = {
+    'all': ('domestic', 'international'),
+    'in': ('domestic',),
+    'out': ('international',)
+}
+
+class TimelineSnapshot:
+    """Newest-first article timeline shared by every user paging it
+    
+    Articles are pulled from the merged per-source streams only as far as the
+    pages requested so far; the materialized prefix is append-only, so earlier
+    pages never change.
+    """
+    __slots__ = ('id', 'kind', 'articles', 'created_at', 'upper_bound', '_pending')
+    _ids = itertools.count(1)
+    
+    def __init__(self, kind, stream, upper_bound):
+        self.id = next(self._ids)
+        self.kind = kind
+        self.articles = []
+        self.created_at = time.monotonic()
+        self.upper_bound = upper_bound  # Total before dedup - exact size is known once exhausted
+        self._pending = stream
+    
+    @property
+    def exhausted(self):
+        return self._pending is None
+    
+    def _materialize(self, count):
+        if self._pending is None or len(self.articles) >= count:
+            return
         
-        # If cache is recent (< 10 minutes) and same command type, use it
-        if time_diff.total_seconds() < 600 and cached_data['command'].startswith(command_type):
-            print(f"📱 Using cached news for user {user_id}: {len(cached_data['news'])} articles")
-            return cached_data['news'], True  # True = from cache
+        self.articles.extend(islice(self._pending, count - len(self.articles)))
+        if len(self.articles) < count:
+            self._pending = None
+    
+    def page(self, number, per_page=ITEMS_PER_PAGE):
+        start = (number - 1) * per_page
+        # One extra article tells whether another page exists
+        self._materialize(start + per_page + 1)
+        return tuple(self.articles[start:start + per_page])
+    
+    def total_pages(self, per_page=ITEMS_PER_PAGE):
+        count = len(self.articles) if self.exhausted else self.upper_bound
+        return (count + per_page - 1) // per_page
+    
+    def size_label(self):
+        return str(len(self.articles)) if self.exhausted else f"~{self.upper_bound}"
+    
+    def pages_label(self, per_page=ITEMS_PER_PAGE):
+        total = self.total_pages(per_page)
+        return str(total) if self.exhausted else f"~{total}"
+
+class UserCursor:
+    """Where one user is in a timeline: snapshot, command and page"""
+    __slots__ = ('snapshot', 'command', 'page', 'touched')
+    
+    def __init__(self, snapshot, command, page):
+        self.snapshot = snapshot
+        self.command = command
+        self.page = page
+        self.touched = time.monotonic()
+
+class Timeline:
+    """Latest snapshot per timeline kind plus an LRU of per-user cursors"""
+    
+    def __init__(self, max_cursors):
+        self.max_cursors = max_cursors
+        self.latest = {}  # kind -> (store versions it was built from, snapshot)
+        self.cursors = OrderedDict()  # user_id -> UserCursor, least recently used first
+    
+    def snapshot(self, kind, versions, streams, upper_bound):
+        """Lazily merged snapshot over the given streams, reused while the store versions match"""
+        latest = self.latest.get(kind)
+        if latest and latest[0] == versions:
+            return latest[1]
+        
+        snapshot = TimelineSnapshot(kind, merge_news_streams(streams, collapse_stories=True), upper_bound)
+        self.latest[kind] = (versions, snapshot)
+        return snapshot
+    
+    def get_cursor(self, user_id):
+        cursor = self.cursors.get(user_id)
+        if cursor is not None:
+            self.cursors.move_to_end(user_id)
+        return cursor
+    
+    def resume(self, user_id, kind):
+        """The user's pinned snapshot if they are still paging the same timeline"""
+        cursor = self.get_cursor(user_id)
+        if cursor and cursor.command == kind and time.monotonic() - cursor.touched < CURSOR_STABLE_SECONDS:
+            return cursor.snapshot
+        return None
     
-    print(f"🔄 Need to collect fresh news for user {user_id}")
-    return [], False  # False = need to collect
+    def set_cursor(self, user_id, snapshot, command, page):
+        self.cursors[user_id] = UserCursor(snapshot, command, page)
+        self.cursors.move_to_end(user_id)
+        while len(self.cursors) > self.max_cursors:
+            self.cursors.popitem(last=False)
 
-async def collect_and_cache_news(user_id, command_type, sources_dict, limit_per_source=15):
-    """Collect fresh news and cache for user"""
-    # Collect with minimal global deduplication for fresh session
-    all_news = await collect_news_enhanced(sources_dict, limit_per_source, use_global_dedup=False)
-    
-    # Cache for user
-    save_user_news_enhanced(user_id, all_news, command_type)
-    
-    return all_news
+timeline = Timeline(MAX_USER_CURSORS)
 
-def save_user_news_enhanced(user_id, news_list, command_type, current_page=1):
-    """Enhanced user news saving with pagination info"""
-    global user_news_cache
+async def get_user_timeline(user_id, kind, page):
+    """Snapshot to render: the user's pinned one while paging forward, else the latest"""
+    if page > 1:
+        snapshot = timeline.resume(user_id, kind)
+        if snapshot is not None:
+            return snapshot, True
     
-    user_news_cache[user_id] = {
-        'news': news_list,  # Full news list
-        'command': command_type,
-        'current_page': current_page,
-        'timestamp': get_current_vietnam_datetime()
-    }
+    groups = TIMELINE_GROUPS[kind]
+    await asyncio.gather(*(ensure_sources_loaded(RSS_FEEDS[group], FEED_LIMITS[group]) for group in groups))
     
-    if len(user_news_cache) > MAX_CACHE_ENTRIES:
-        oldest_users = sorted(user_news_cache.items(), key=lambda x: x[1]['timestamp'])[:10]
-        for user_id_to_remove, _ in oldest_users:
-            del user_news_cache[user_id_to_remove]
-
-def save_user_page_context(user_id, page_news, page_number):
-    """Save current page context for !chitiet"""
-    global user_news_cache
+    # One global newest-first merge across every source in the timeline
+    versions, streams, upper_bound = (), [], 0
+    for group in groups:
+        group_versions, group_streams, group_bound = article_store.streams(RSS_FEEDS[group], FEED_LIMITS[group])
+        versions += group_versions
+        streams += group_streams
+        upper_bound += group_bound
     
-    if user_id in user_news_cache:
-        user_news_cache[user_id]['current_page'] = page_number
-        user_news_cache[user_id]['current_page_news'] = page_news  # Current page's 12 items
+    return timeline.snapshot(kind, versions, streams, upper_bound), False
 
 def save_user_last_detail(user_id, news_item):
     """Save last article accessed via !chitiet"""
@@ -836,67 +2127,87 @@ def save_user_last_detail(user_id, news_item):
     }
 
 # 🔧 DISCORD EMBED HELPERS
+# Sentence ends (including Vietnamese-friendly terminators) followed by whitespace, or a line break
+_SENTENCE_BOUNDARY_RE = re.compile(r'[.!?…;:]+(?=\s)|\n')
+
 def split_text_for_discord(text: str, max_length: int = 950) -> List[str]:
-    """Split text to fit Discord field limits"""
+    """Split text to fit Discord field limits, preferring sentence and line boundaries
+    
+    Single pass over the boundary positions; parts are sliced out of the original
+    text, so the cost stays linear in the input size.
+    """
     if len(text) <= max_length:
         return [text]
     
     parts = []
-    current_part = ""
+    start = 0
+    last_break = 0
     
-    sentences = text.split('. ')
+    boundaries = [match.end() for match in _SENTENCE_BOUNDARY_RE.finditer(text)]
+    boundaries.append(len(text))
     
-    for sentence in sentences:
-        if len(current_part + sentence + '. ') <= max_length:
-            current_part += sentence + '. '
-        else:
-            if current_part:
-                parts.append(current_part.strip())
-                current_part = sentence + '. '
+    for boundary in boundaries:
+        while boundary - start > max_length:
+            if last_break > start:
+                cut = last_break
             else:
-                parts.append(sentence[:max_length])
-                current_part = ""
+                # No boundary in range - cut at the last space, or hard-cut
+                space = text.rfind(' ', start + max_length // 2, start + max_length)
+                cut = space if space > start else start + max_length
+            
+            part = text[start:cut].strip()
+            if part:
+                parts.append(part)
+            start = cut
+        last_break = boundary
     
-    if current_part:
-        parts.append(current_part.strip())
+    tail = text[start:].strip()
+    if tail:
+        parts.append(tail)
     
     return parts
 
 def create_optimized_embeds(title: str, content: str, color: int = 0x9932cc) -> List[discord.Embed]:
-    """Create optimized embeds for Discord limits"""
+    """Create optimized embeds for Discord limits, packing several content fields per embed"""
     embeds = []
     
     content_parts = split_text_for_discord(content, 950)
+    multi_part = len(content_parts) > 1
+    
+    embed = None
+    embed_chars = 0
     
     for i, part in enumerate(content_parts):
-        if i == 0:
-            embed = discord.Embed(
-                title=validate_and_truncate_content(title, DISCORD_EMBED_TITLE_LIMIT),
-                color=color,
-                timestamp=get_current_vietnam_datetime()
-            )
-        else:
+        field_name = f"📄 Nội dung {f'(Phần {i+1})' if multi_part else ''}"
+        safe_field_name, safe_field_value = validate_embed_field(field_name, part)
+        field_chars = len(safe_field_name) + len(safe_field_value)
+        
+        # Leave one field slot free for a trailing link field
+        if embed is None or len(embed.fields) >= DISCORD_EMBED_FIELD_LIMIT - 1 or embed_chars + field_chars > DISCORD_EMBED_TOTAL_EMBED_LIMIT:
+            if embed is None:
+                embed_title = validate_and_truncate_content(title, DISCORD_EMBED_TITLE_LIMIT)
+            else:
+                embed_title = validate_and_truncate_content(f"{title[:150]}... (Phần {i+1})", DISCORD_EMBED_TITLE_LIMIT)
+            
             embed = discord.Embed(
-                title=validate_and_truncate_content(f"{title[:150]}... (Phần {i+1})", DISCORD_EMBED_TITLE_LIMIT),
+                title=embed_title,
                 color=color,
                 timestamp=get_current_vietnam_datetime()
             )
-        
-        field_name = f"📄 Nội dung {f'(Phần {i+1})' if len(content_parts) > 1 else ''}"
-        safe_field_name, safe_field_value = validate_embed_field(field_name, part)
+            embeds.append(embed)
+            embed_chars = len(embed_title)
         
         embed.add_field(
             name=safe_field_name,
             value=safe_field_value,
             inline=False
         )
-        
-        embeds.append(embed)
+        embed_chars += field_chars
     
     return embeds
 
-def create_safe_embed_with_fields(title: str, description: str, fields_data: List[Tuple[str, str]], color: int = 0x00ff88) -> List[discord.Embed]:
-    """Create safe embeds with multiple fields"""
+def create_embeds_from_safe_fields(title: str, description: str, safe_fields, color: int = 0x00ff88) -> List[discord.Embed]:
+    """Lay out already-validated fields across as many embeds as the limits need"""
     embeds = []
     
     safe_title = validate_and_truncate_content(title, DISCORD_EMBED_TITLE_LIMIT, "...")
@@ -913,9 +2224,7 @@ def create_safe_embed_with_fields(title: str, description: str, fields_data: Lis
     current_embed = main_embed
     total_chars = len(safe_title) + len(safe_description)
     
-    for field_name, field_value in fields_data:
-        safe_name, safe_value = validate_embed_field(field_name, field_value)
-        
+    for safe_name, safe_value in safe_fields:
         field_chars = len(safe_name) + len(safe_value)
         
         if fields_added >= 20 or total_chars + field_chars > DISCORD_EMBED_TOTAL_EMBED_LIMIT:
@@ -936,22 +2245,529 @@ def create_safe_embed_with_fields(title: str, description: str, fields_data: Lis
     
     return embeds
 
+# 🖼️ LISTING RENDERER - One render per (snapshot, page, command), shared by all users
+LISTING_TITLE_LENGTH = 55
+LISTING_RENDER_CACHE_SIZE = int(os.getenv('LISTING_RENDER_CACHE_SIZE', '256'))
+LISTING_STYLES = {
+    'all': {'title': "📰 Trang {page}", 'color': 0x00ff88, 'footer': "{page}/{total}"},
+    'out': {'title': "🌍 Trang {page}", 'color': 0x0066ff, 'footer': "{page}/{total}"},
+    'in': {'title': "🇻🇳 Trang {page}", 'color': 0xff0000, 'footer': "Trang {page}/{total} • !chitiet [số]"}
+}
+
+class ListingRenderer:
+    """LRU of rendered listing pages, stored as embed dicts"""
+    
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self.pages = OrderedDict()  # (snapshot id, page, command, exhausted, story counts) -> [embed dict]
+        self.stats = {'hits': 0, 'misses': 0}
+    
+    def stats_line(self, snapshot, page_news, command):
+        if command == 'all':
+            domestic_count = sum(1 for news in page_news if news.source in RSS_FEEDS['domestic'])
+            international_count = len(page_news) - domestic_count
+            return f"🇻🇳 {domestic_count} • 🌍 {international_count} • 📊 {snapshot.size_label()}"
+        if command == 'out':
+            return f"🌍 {snapshot.size_label()} tin"
+        return f"🇻🇳 {snapshot.size_label()} tin"
+    
+    def render(self, snapshot, page, command):
+        """Embeds for one listing page, or None if the page is empty"""
+        page_news = snapshot.page(page)
+        if not page_news:
+            return None
+        
+        # Labels change once the snapshot is exhausted (~N -> N) and stories keep growing,
+        # so both are part of the key - a stale page is rebuilt rather than served
+        related_counts = tuple(len(story_clusterer.related(news, limit=None)) for news in page_news)
+        key = (snapshot.id, page, command, snapshot.exhausted, related_counts)
+        payload = self.pages.get(key)
+        
+        if payload is not None:
+            self.pages.move_to_end(key)
+            self.stats['hits'] += 1
+        else:
+            self.stats['misses'] += 1
+            style = LISTING_STYLES[command]
+            safe_fields = [("📊", self.stats_line(snapshot, page_news, command))]
+            for i, (news, related_count) in enumerate(zip(page_news, related_counts), 1):
+                label, value = news.listing_field
+                if related_count:
+                    value = f"{value} • 🧵 +{related_count}"
+                safe_fields.append((f"{i}. {label}", value))
+            
+            embeds = create_embeds_from_safe_fields(style['title'].format(page=page), "", safe_fields, style['color'])
+            footer = style['footer'].format(page=page, total=snapshot.pages_label())
+            for embed in embeds:
+                embed.set_footer(text=footer)
+            
+            payload = [embed.to_dict() for embed in embeds]
+            self.pages[key] = payload
+            while len(self.pages) > self.max_entries:
+                self.pages.popitem(last=False)
+        
+        # Fresh Embed objects per send - the cached dicts are never mutated
+        return [discord.Embed.from_dict(data) for data in payload]
+
+listing_renderer = ListingRenderer(LISTING_RENDER_CACHE_SIZE)
+
+async def send_news_listing(ctx, command, page):
+    """Shared body of !all / !in / !out"""
+    user_id = ctx.author.id
+    snapshot, is_cached = await get_user_timeline(user_id, command, page)
+    embeds = listing_renderer.render(snapshot, page, command)
+    
+    if embeds is None:
+        total_pages = snapshot.total_pages()
+        
+        # If no news and cache is large, suggest clearing cache
+        if command == 'all' and len(global_seen_articles) > 200:
+            await ctx.send(f"❌ Không có tin tức ở trang {page}! Cache có thể đầy. Dùng `!clear` để xóa cache hoặc `!debug` để kiểm tra.")
+        else:
+            await ctx.send(f"❌ Không có tin tức ở trang {page}! Tổng cộng có {total_pages} trang.")
+        return
+    
+    # Remember position for !chitiet and the next page
+    timeline.set_cursor(user_id, snapshot, command, page)
+    
+    await send_embeds_batched(ctx, embeds)
+
+# 📦 BATCHED SENDING - Up to 10 embeds / 6000 chars per message
+DISCORD_MAX_EMBEDS_PER_MESSAGE = 10
+DISCORD_MESSAGE_EMBEDS_CHAR_LIMIT = 6000
+
+def pack_embeds(embeds: List[discord.Embed]) -> List[List[discord.Embed]]:
+    """Group embeds, in order, into the fewest messages Discord will accept"""
+    batches = []
+    current_batch = []
+    current_chars = 0
+    
+    for embed in embeds:
+        embed_chars = len(embed)
+        
+        if current_batch and (
+            len(current_batch) >= DISCORD_MAX_EMBEDS_PER_MESSAGE
+            or current_chars + embed_chars > DISCORD_MESSAGE_EMBEDS_CHAR_LIMIT
+        ):
+            batches.append(current_batch)
+            current_batch = []
+            current_chars = 0
+        
+        current_batch.append(embed)
+        current_chars += embed_chars
+    
+    if current_batch:
+        batches.append(current_batch)
+    
+    return batches
+
+async def send_embeds_batched(ctx, embeds: List[discord.Embed]):
+    """Send embeds packed into as few messages as possible"""
+    for batch in pack_embeds(embeds):
+        await ctx.send(embeds=batch)
+
+# ⚡ STREAMING OUTPUT - Progressive edits while Gemini is still generating
+STREAM_EDIT_INTERVAL = float(os.getenv('STREAM_EDIT_INTERVAL', '1.5'))  # stay under Discord's edit rate limit
+
+def embed_signature(embed: discord.Embed):
+    """What a user actually sees in an embed (ignores the timestamp)"""
+    return (
+        embed.title,
+        embed.description,
+        tuple((field.name, field.value) for field in embed.fields),
+        embed.footer.text
+    )
+
+async def stream_to_discord(ctx, progress_msg, title: str, chunks, color: int, footer: str = ""):
+    """Render streamed text into progress_msg, rolling over into new messages as it grows
+    
+    Edits are throttled to STREAM_EDIT_INTERVAL and only messages whose content changed
+    are edited. Returns the full text.
+    """
+    text = ""
+    messages = [progress_msg]
+    shown = [None]
+    last_render = 0.0
+    
+    async def render(final):
+        body = text.strip() if final else text.strip() + " ▌"
+        embeds = create_optimized_embeds(title, body or "⏳", color)
+        if final and footer and embeds:
+            embeds[-1].set_footer(text=footer)
+        
+        for i, batch in enumerate(pack_embeds(embeds)):
+            signature = [embed_signature(embed) for embed in batch]
+            if i < len(messages):
+                if shown[i] != signature:
+                    await messages[i].edit(content=None, embeds=batch)
+                    shown[i] = signature
+            else:
+                messages.append(await ctx.send(embeds=batch))
+                shown.append(signature)
+    
+    async for chunk in chunks:
+        text += chunk
+        if time.monotonic() - last_render >= STREAM_EDIT_INTERVAL:
+            await render(final=False)
+            last_render = time.monotonic()
+    
+    await render(final=True)
+    return text.strip()
+
+# 🧭 GEMINI SCHEDULER - Shared models, bounded concurrency, priorities, rate limit
+GEMINI_MODEL_NAME = 'gemini-2.0-flash-exp'
+GEMINI_MAX_CONCURRENCY = int(os.getenv('GEMINI_MAX_CONCURRENCY', '3'))
+GEMINI_RATE_PER_MINUTE = float(os.getenv('GEMINI_RATE_PER_MINUTE', '15'))
+GEMINI_BURST = int(os.getenv('GEMINI_BURST', '5'))
+PRIORITY_INTERACTIVE = 0   # !hoi, !debate, !chitiet
+PRIORITY_BACKGROUND = 10   # precomputation
+
+class TokenBucket:
+    """Token bucket rate limiter"""
+    
+    def __init__(self, rate_per_second, capacity):
+        self.rate_per_second = rate_per_second
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+    
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate_per_second)
+        self.updated = now
+    
+    async def acquire(self):
+        while True:
+            self._refill()
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return
+            await asyncio.sleep((1 - self.tokens) / self.rate_per_second)
+
+def create_gemini_model(model_name, generation_config):
+    """Build a Gemini model bound to one generation config"""
+    return genai.GenerativeModel(
+        model_name,
+        generation_config=genai.types.GenerationConfig(**generation_config)
+    )
+
+class GeminiJob:
+    """One queued Gemini request; chunks is set for streaming requests"""
+    __slots__ = ('prompt', 'model_name', 'generation_config', 'future', 'chunks', 'cancelled')
+    
+    def __init__(self, prompt, model_name, generation_config, future, chunks=None):
+        self.prompt = prompt
+        self.model_name = model_name
+        self.generation_config = generation_config
+        self.future = future
+        self.chunks = chunks
+        self.cancelled = threading.Event()
+
+class GeminiScheduler:
+    """Priority queue in front of Gemini
+    
+    A fixed set of workers bounds concurrency, a token bucket bounds the request
+    rate, and lower priority numbers are served first. model_factory is injectable
+    so the scheduler can run against a fake model.
+    """
+    
+    def __init__(self, model_factory, max_concurrency, rate_per_minute, burst):
+        self.model_factory = model_factory
+        self.max_concurrency = max_concurrency
+        self.bucket = TokenBucket(rate_per_minute / 60, burst)
+        self.models = {}
+        self.queue = None
+        self.workers = []
+        self.sequence = itertools.count()
+        self.stats = {'submitted': 0, 'completed': 0, 'failed': 0, 'expired': 0}
+    
+    def get_model(self, model_name, generation_config):
+        """Cached model instance per (model, config)"""
+        key = (model_name, tuple(sorted(generation_config.items())))
+        model = self.models.get(key)
+        if model is None:
+            model = self.model_factory(model_name, generation_config)
+            self.models[key] = model
+        return model
+    
+    def _ensure_workers(self):
+        if self.queue is None:
+            self.queue = asyncio.PriorityQueue()
+        
+        self.workers = [worker for worker in self.workers if not worker.done()]
+        while len(self.workers) < self.max_concurrency:
+            self.workers.append(asyncio.create_task(self._worker()))
+    
+    async def _worker(self):
+        while True:
+            _, _, job = await self.queue.get()
+            
+            try:
+                # Caller already gave up (timeout) - don't spend quota on it
+                if job.future.done():
+                    self.stats['expired'] += 1
+                    continue
+                
+                await self.bucket.acquire()
+                if job.future.done():
+                    self.stats['expired'] += 1
+                    continue
+                
+                model = self.get_model(job.model_name, job.generation_config)
+                
+                if job.chunks is None:
+                    response = await asyncio.to_thread(model.generate_content, job.prompt)
+                    result = response.text
+                else:
+                    await asyncio.to_thread(self._consume_stream, model, job, asyncio.get_running_loop())
+                    job.chunks.put_nowait(None)  # end of stream
+                    result = None
+                
+                self.stats['completed'] += 1
+                if not job.future.done():
+                    job.future.set_result(result)
+            except Exception as e:
+                self.stats['failed'] += 1
+                if job.chunks is not None:
+                    job.chunks.put_nowait(e)
+                if not job.future.done():
+                    job.future.set_exception(e)
+                    job.future.exception()  # streaming callers read errors from chunks
+            finally:
+                self.queue.task_done()
+    
+    @staticmethod
+    def _consume_stream(model, job, loop):
+        """Runs in a thread: forward streamed text back to the event loop"""
+        for chunk in model.generate_content(job.prompt, stream=True):
+            if job.cancelled.is_set():
+                break
+            text = chunk.text
+            if text:
+                loop.call_soon_threadsafe(job.chunks.put_nowait, text)
+    
+    async def _submit(self, job, priority):
+        self._ensure_workers()
+        self.stats['submitted'] += 1
+        await self.queue.put((priority, next(self.sequence), job))
+    
+    async def generate(self, prompt, generation_config, priority=PRIORITY_INTERACTIVE,
+                       timeout=None, model_name=GEMINI_MODEL_NAME):
+        """Queue a request and wait for its text; raises asyncio.TimeoutError on timeout"""
+        job = GeminiJob(prompt, model_name, generation_config, asyncio.get_running_loop().create_future())
+        await self._submit(job, priority)
+        
+        return await asyncio.wait_for(job.future, timeout)
+    
+    async def stream(self, prompt, generation_config, priority=PRIORITY_INTERACTIVE,
+                     timeout=None, model_name=GEMINI_MODEL_NAME):
+        """Queue a streaming request and yield text chunks as they arrive
+        
+        timeout bounds the wait for each chunk (including the first), not the whole answer.
+        """
+        job = GeminiJob(
+            prompt, model_name, generation_config,
+            asyncio.get_running_loop().create_future(), asyncio.Queue()
+        )
+        await self._submit(job, priority)
+        
+        try:
+            while True:
+                item = await asyncio.wait_for(job.chunks.get(), timeout)
+                if item is None:
+                    return
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            job.cancelled.set()
+            if not job.future.done():
+                job.future.cancel()
+    
+    def pending(self):
+        return self.queue.qsize() if self.queue else 0
+    
+    async def stop(self):
+        for worker in self.workers:
+            worker.cancel()
+        await asyncio.gather(*self.workers, return_exceptions=True)
+        self.workers = []
+
+gemini_scheduler = GeminiScheduler(
+    create_gemini_model,
+    GEMINI_MAX_CONCURRENCY,
+    GEMINI_RATE_PER_MINUTE,
+    GEMINI_BURST
+)
+
+# 🧠 GEMINI RESPONSE CACHE - Answers keyed by prompt fingerprint
+GEMINI_CACHE_TTL = int(os.getenv('GEMINI_CACHE_TTL', str(6 * 3600)))
+GEMINI_CACHE_MAX_BYTES = int(os.getenv('GEMINI_CACHE_MAX_BYTES', str(4 * 1024 * 1024)))
+GEMINI_CACHE_DISK_MAX_BYTES = int(os.getenv('GEMINI_CACHE_DISK_MAX_BYTES', str(16 * 1024 * 1024)))
+GEMINI_CACHE_DB = os.getenv('GEMINI_CACHE_DB', CONTENT_CACHE_DB)  # empty = memory only
+GEMINI_BYPASS_FLAG = '--fresh'
+
+gemini_response_cache = ContentCache(
+    GEMINI_CACHE_TTL,
+    GEMINI_CACHE_MAX_BYTES,
+    GEMINI_CACHE_DB,
+    GEMINI_CACHE_DISK_MAX_BYTES,
+    table='gemini_cache',
+    key_func=None
+)
+
+def seconds_until_vietnam_midnight():
+    """Answers mention today's date, so they must not outlive it"""
+    now = get_current_vietnam_datetime()
+    midnight = (now + timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
+    return max(1, int((midnight - now).total_seconds()))
+
+def gemini_fingerprint(method, generation_config, question, article_content=""):
+    """Cache key: method, model, config, normalized question, article hash and today's date"""
+    normalized_question = _WHITESPACE_RE.sub(' ', question.lower().strip())
+    content_hash = hashlib.sha256(article_content.encode('utf-8')).hexdigest() if article_content else ""
+    
+    payload = json.dumps([
+        method,
+        GEMINI_MODEL_NAME,
+        sorted(generation_config.items()),
+        normalized_question,
+        content_hash,
+        get_current_date_str()
+    ], ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+def split_bypass_flag(text):
+    """Strip a leading --fresh flag; returns (text, use_cache)"""
+    stripped = text.strip()
+    if stripped.lower().startswith(GEMINI_BYPASS_FLAG):
+        return stripped[len(GEMINI_BYPASS_FLAG):].strip(), False
+    return stripped, True
+
+# 🌐 PRECOMPUTE PIPELINE - Translate fresh international articles before anyone asks
+PRECOMPUTE_TOP_N = int(os.getenv('PRECOMPUTE_TOP_N', '5'))
+PRECOMPUTE_QUEUE_SIZE = int(os.getenv('PRECOMPUTE_QUEUE_SIZE', '10'))
+PRECOMPUTE_BUDGET_PER_HOUR = int(os.getenv('PRECOMPUTE_BUDGET_PER_HOUR', '20'))  # Gemini calls
+PRECOMPUTE_MAX_AGE_HOURS = float(os.getenv('PRECOMPUTE_MAX_AGE_HOURS', '6'))
+
+class PrecomputePipeline:
+    """Bounded background queue that fills the content cache for international articles
+    
+    Spending is capped by an hourly Gemini budget, a full queue drops new offers
+    (backpressure), and articles that age out while queued are skipped.
+    """
+    
+    def __init__(self, top_n, queue_size, budget_per_hour, max_age_hours):
+        self.top_n = top_n
+        self.queue_size = queue_size
+        self.budget_per_hour = budget_per_hour
+        self.max_age_seconds = max_age_hours * 3600
+        self.queue = None
+        self.queued = set()     # normalized URLs waiting in the queue
+        self.spent = deque()    # monotonic timestamps of Gemini calls in the last hour
+        self.worker = None
+        self.stats = {'queued': 0, 'done': 0, 'dropped': 0, 'stale': 0, 'cached': 0, 'over_budget': 0}
+    
+    @property
+    def enabled(self):
+        return bool(GEMINI_API_KEY and GEMINI_AVAILABLE and self.top_n > 0 and self.budget_per_hour > 0)
+    
+    def start(self):
+        if not self.enabled or (self.worker and not self.worker.done()):
+            return
+        self.queue = asyncio.Queue(maxsize=self.queue_size)
+        self.worker = asyncio.create_task(self._run())
+    
+    async def stop(self):
+        if self.worker:
+            self.worker.cancel()
+            await asyncio.gather(self.worker, return_exceptions=True)
+            self.worker = None
+    
+    def budget_left(self):
+        cutoff = time.monotonic() - 3600
+        while self.spent and self.spent[0] < cutoff:
+            self.spent.popleft()
+        return self.budget_per_hour - len(self.spent)
+    
+    def is_stale(self, news_item):
+        return time.time() - news_item.published_ts > self.max_age_seconds
+    
+    def offer_latest(self):
+        """Queue the freshest international articles that aren't cached or queued yet"""
+        if self.queue is None:
+            return
+        
+        _, streams, _ = article_store.streams(RSS_FEEDS['international'], FEED_LIMITS['international'])
+        for news_item in islice(merge_news_streams(streams), self.top_n):
+            key = normalize_article_url(news_item.link)
+            if key in self.queued or key in content_cache.memory or self.is_stale(news_item):
+                continue
+            
+            try:
+                self.queue.put_nowait(news_item)
+            except asyncio.QueueFull:
+                self.stats['dropped'] += 1
+                break
+            
+            self.queued.add(key)
+            self.stats['queued'] += 1
+    
+    async def _run(self):
+        while True:
+            news_item = await self.queue.get()
+            key = normalize_article_url(news_item.link)
+            
+            try:
+                if self.is_stale(news_item):
+                    self.stats['stale'] += 1
+                    continue
+                
+                if await content_cache.get(news_item.link) is not None:
+                    self.stats['cached'] += 1
+                    continue
+                
+                if self.budget_left() <= 0:
+                    self.stats['over_budget'] += 1
+                    continue
+                
+                self.spent.append(time.monotonic())
+                await extract_content_enhanced(
+                    news_item.link, news_item.source, news_item,
+                    priority=PRIORITY_BACKGROUND
+                )
+                self.stats['done'] += 1
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"⚠️ Precompute error for {news_item.link}: {e}")
+            finally:
+                self.queued.discard(key)
+                self.queue.task_done()
+
+precompute_pipeline = PrecomputePipeline(
+    PRECOMPUTE_TOP_N,
+    PRECOMPUTE_QUEUE_SIZE,
+    PRECOMPUTE_BUDGET_PER_HOUR,
+    PRECOMPUTE_MAX_AGE_HOURS
+)
+
 # 🆕 GEMINI AI SYSTEM
 class GeminiAIEngine:
+    QUESTION_CONFIG = {'temperature': 0.2, 'top_p': 0.8, 'max_output_tokens': 1500}
+    DEBATE_CONFIG = {'temperature': 0.4, 'top_p': 0.9, 'max_output_tokens': 1500}
+    ANALYSIS_CONFIG = {'temperature': 0.2, 'top_p': 0.8, 'max_output_tokens': 2000}
+    
     def __init__(self):
         self.available = GEMINI_AVAILABLE and GEMINI_API_KEY
         if self.available:
             genai.configure(api_key=GEMINI_API_KEY)
     
-    async def ask_question(self, question: str, context: str = ""):
-        """Gemini AI question answering with context"""
-        if not self.available:
-            return "⚠️ Gemini AI không khả dụng."
+    # --- prompts ---
+    def build_question_prompt(self, question: str, context: str = ""):
+        current_date_str = get_current_date_str()
         
-        try:
-            current_date_str = get_current_date_str()
-            
-            prompt = f"""Bạn là Gemini AI - chuyên gia kinh tế tài chính thông minh. Hãy trả lời câu hỏi dựa trên kiến thức chuyên môn của bạn.
+        return f"""Bạn là Gemini AI - chuyên gia kinh tế tài chính thông minh. Hãy trả lời câu hỏi dựa trên kiến thức chuyên môn của bạn.
 
 CÂU HỎI: {question}
 
@@ -966,38 +2782,9 @@ HƯỚNG DẪN TRẢ LỜI:
 6. Sử dụng đầu mục số để tổ chức nội dung
 
 Hãy thể hiện trí thông minh và kiến thức chuyên sâu của Gemini AI:"""
-
-            model = genai.GenerativeModel('gemini-2.0-flash-exp')
-            
-            generation_config = genai.types.GenerationConfig(
-                temperature=0.2,
-                top_p=0.8,
-                max_output_tokens=1500,
-            )
-            
-            response = await asyncio.wait_for(
-                asyncio.to_thread(
-                    model.generate_content,
-                    prompt,
-                    generation_config=generation_config
-                ),
-                timeout=15
-            )
-            
-            return response.text.strip()
-            
-        except asyncio.TimeoutError:
-            return "⚠️ Gemini AI timeout. Vui lòng thử lại."
-        except Exception as e:
-            return f"⚠️ Lỗi Gemini AI: {str(e)}"
     
-    async def debate_perspectives(self, topic: str):
-        """Multi-perspective debate system"""
-        if not self.available:
-            return "⚠️ Gemini AI không khả dụng."
-        
-        try:
-            prompt = f"""Tổ chức cuộc tranh luận về: {topic}
+    def build_debate_prompt(self, topic: str):
+        return f"""Tổ chức cuộc tranh luận về: {topic}
 
 6 quan điểm khác nhau:
 💸 **Nhà KT Tham Nhũng:** [ích kỷ, bóp méo số liệu]
@@ -1009,40 +2796,11 @@ Hãy thể hiện trí thông minh và kiến thức chuyên sâu của Gemini A
 🤖 **Tổng Kết:** [phân tích khách quan]
 
 Mỗi góc nhìn 80-120 từ, thể hiện rõ tính cách:"""
-
-            model = genai.GenerativeModel('gemini-2.0-flash-exp')
-            
-            generation_config = genai.types.GenerationConfig(
-                temperature=0.4,
-                top_p=0.9,
-                max_output_tokens=1500,
-            )
-            
-            response = await asyncio.wait_for(
-                asyncio.to_thread(
-                    model.generate_content,
-                    prompt,
-                    generation_config=generation_config
-                ),
-                timeout=20
-            )
-            
-            return response.text.strip()
-            
-        except asyncio.TimeoutError:
-            return "⚠️ Gemini AI timeout."
-        except Exception as e:
-            return f"⚠️ Lỗi Gemini AI: {str(e)}"
     
-    async def analyze_article(self, article_content: str, question: str = ""):
-        """Analyze specific article with Gemini - Vietnamese response"""
-        if not self.available:
-            return "⚠️ Gemini AI không khả dụng cho phân tích bài báo."
+    def build_analysis_prompt(self, article_content: str, question: str = ""):
+        analysis_question = question if question else "Hãy phân tích và tóm tắt bài báo này"
         
-        try:
-            analysis_question = question if question else "Hãy phân tích và tóm tắt bài báo này"
-            
-            prompt = f"""Bạn là Gemini AI - chuyên gia kinh tế tài chính thông minh. Hãy phân tích bài báo dựa trên NỘI DUNG HOÀN CHỈNH được cung cấp.
+        return f"""Bạn là Gemini AI - chuyên gia kinh tế tài chính thông minh. Hãy phân tích bài báo dựa trên NỘI DUNG HOÀN CHỈNH được cung cấp.
 
 **NỘI DUNG BÀI BÁO HOÀN CHỈNH:**
 {article_content}
@@ -1061,34 +2819,111 @@ Mỗi góc nhìn 80-120 từ, thể hiện rõ tính cách:"""
 8. CHỈ phân tích bài báo được cung cấp
 
 **QUAN TRỌNG:** Tập trung hoàn toàn vào nội dung từ bài báo đã cung cấp. Đưa ra phân tích THÔNG MINH và CHI TIẾT bằng tiếng Việt:"""
-
-            model = genai.GenerativeModel('gemini-2.0-flash-exp')
-            
-            generation_config = genai.types.GenerationConfig(
-                temperature=0.2,
-                top_p=0.8,
-                max_output_tokens=2000,
-            )
-            
-            response = await asyncio.wait_for(
-                asyncio.to_thread(
-                    model.generate_content,
-                    prompt,
-                    generation_config=generation_config
-                ),
-                timeout=20
-            )
-            
-            return response.text.strip()
-            
+    
+    # --- request helpers ---
+    async def _stream(self, prompt, generation_config, timeout, timeout_message, cache_key=None):
+        if cache_key:
+            cached_text = await gemini_response_cache.get(cache_key)
+            if cached_text is not None:
+                yield cached_text
+                return
+        
+        parts = []
+        try:
+            async for chunk in gemini_scheduler.stream(
+                prompt,
+                generation_config,
+                priority=PRIORITY_INTERACTIVE,
+                timeout=timeout
+            ):
+                parts.append(chunk)
+                yield chunk
         except asyncio.TimeoutError:
-            return "⚠️ Gemini AI timeout khi phân tích bài báo."
+            yield f"\n\n{timeout_message}"
+            return
         except Exception as e:
-            return f"⚠️ Lỗi Gemini AI: {str(e)}"
+            yield f"\n\n⚠️ Lỗi Gemini AI: {str(e)}"
+            return
+        
+        # Only complete, successful answers are cached
+        response_text = "".join(parts).strip()
+        if cache_key and response_text:
+            await gemini_response_cache.set(
+                cache_key, response_text,
+                ttl_seconds=min(GEMINI_CACHE_TTL, seconds_until_vietnam_midnight())
+            )
+    
+    # --- streaming responses (timeout applies per chunk) ---
+    async def stream_question(self, question: str, context: str = "", use_cache: bool = True):
+        """Gemini AI question answering with context - yields text chunks"""
+        if not self.available:
+            yield "⚠️ Gemini AI không khả dụng."
+            return
+        
+        cache_key = gemini_fingerprint('question', self.QUESTION_CONFIG, question, context) if use_cache else None
+        async for chunk in self._stream(
+            self.build_question_prompt(question, context),
+            self.QUESTION_CONFIG, 15, "⚠️ Gemini AI timeout. Vui lòng thử lại.", cache_key
+        ):
+            yield chunk
+    
+    async def stream_debate(self, topic: str, use_cache: bool = True):
+        """Multi-perspective debate system - yields text chunks"""
+        if not self.available:
+            yield "⚠️ Gemini AI không khả dụng."
+            return
+        
+        cache_key = gemini_fingerprint('debate', self.DEBATE_CONFIG, topic) if use_cache else None
+        async for chunk in self._stream(
+            self.build_debate_prompt(topic),
+            self.DEBATE_CONFIG, 20, "⚠️ Gemini AI timeout.", cache_key
+        ):
+            yield chunk
+    
+    async def stream_analysis(self, article_content: str, question: str = "", use_cache: bool = True):
+        """Analyze specific article with Gemini (Vietnamese response) - yields text chunks"""
+        if not self.available:
+            yield "⚠️ Gemini AI không khả dụng cho phân tích bài báo."
+            return
+        
+        cache_key = gemini_fingerprint('analysis', self.ANALYSIS_CONFIG, question, article_content) if use_cache else None
+        async for chunk in self._stream(
+            self.build_analysis_prompt(article_content, question),
+            self.ANALYSIS_CONFIG, 20, "⚠️ Gemini AI timeout khi phân tích bài báo.", cache_key
+        ):
+            yield chunk
 
 # Initialize Gemini Engine
 gemini_engine = GeminiAIEngine()
 
+# 🤖 BOT LIFECYCLE - Owns long-lived resources (HTTP pool, ...)
+class NewsBot(commands.Bot):
+    async def setup_hook(self):
+        """Create shared resources once, before connecting to the gateway"""
+        await get_http_session()
+        parsing_service.start()
+        # Serve the last known articles immediately; pollers revalidate them in the background
+        await article_db.warm_start(article_store, global_seen_articles)
+        article_db.start_autosave(global_seen_articles, SEEN_SAVE_INTERVAL)
+        precompute_pipeline.start()
+        start_feed_pollers()
+    
+    async def close(self):
+        """Release shared resources on shutdown"""
+        await stop_feed_pollers()
+        await precompute_pipeline.stop()
+        await close_http_session()
+        await gemini_scheduler.stop()
+        await article_db.stop_autosave()
+        await article_db.save_seen(global_seen_articles)
+        article_db.close()
+        content_cache.close()
+        gemini_response_cache.close()
+        parsing_service.shutdown()
+        await super().close()
+
+bot = NewsBot(command_prefix='!', intents=intents)
+
 # Bot event handlers
 @bot.event
 async def on_ready():
@@ -1128,104 +2963,7 @@ async def get_all_news_enhanced(ctx, page=1):
     """Tin tức từ CafeF và các nguồn free quốc tế"""
     try:
         page = max(1, int(page))
-        loading_msg = await ctx.send(f"⏳")
-        
-        # Concurrent processing
-        domestic_task = collect_news_enhanced(RSS_FEEDS['domestic'], 15)
-        international_task = collect_news_enhanced(RSS_FEEDS['international'], 20)
-        
-        domestic_news, international_news = await asyncio.gather(domestic_task, international_task)
-        
-        await loading_msg.delete()
-        
-        all_news = domestic_news + international_news
-        
-        items_per_page = 12
-        start_index = (page - 1) * items_per_page
-        end_index = start_index + items_per_page
-        page_news = all_news[start_index:end_index]
-        
-        if not page_news:
-            total_pages = (len(all_news) + items_per_page - 1) // items_per_page if all_news else 0
-            
-            # If no news and cache is large, suggest clearing cache
-            if len(global_seen_articles) > 200:
-                await ctx.send(f"❌ Không có tin tức ở trang {page}! Cache có thể đầy. Dùng `!clear` để xóa cache hoặc `!debug` để kiểm tra.")
-            else:
-                await ctx.send(f"❌ Không có tin tức ở trang {page}! Tổng cộng có {total_pages} trang.")
-            return
-        
-        # Prepare fields data
-        fields_data = []
-        
-        domestic_count = sum(1 for news in page_news if news['source'] in RSS_FEEDS['domestic'])
-        international_count = len(page_news) - domestic_count
-        
-        # Enhanced source mapping for FREE sources only
-        source_names = {
-            # CafeF sources
-            'cafef_chungkhoan': 'CafeF CK', 'cafef_batdongsan': 'CafeF BĐS',
-            'cafef_taichinh': 'CafeF TC', 'cafef_vimo': 'CafeF VM', 'cafef_doanhnghiep': 'CafeF DN',
-            
-            # FREE international sources
-            'yahoo_finance_main': 'Yahoo RSS', 'yahoo_finance_headlines': 'Yahoo Headlines',
-            'yahoo_finance_rss': 'Yahoo Finance', 'cnn_money': 'CNN Money', 
-            'reuters_topnews': 'Reuters', 'reuters_business': 'Reuters Biz',
-            'marketwatch': 'MarketWatch', 'business_insider': 'Business Insider',
-            'cnbc': 'CNBC', 'investing_com': 'Investing.com', 
-            'investopedia': 'Investopedia', 'economic_times': 'Economic Times',
-            'bbc_business': 'BBC Business', 'guardian_business': 'The Guardian',
-            'coindesk': 'CoinDesk', 'nasdaq_news': 'Nasdaq',
-            'seeking_alpha': 'Seeking Alpha', 'benzinga': 'Benzinga'
-        }
-        
-        emoji_map = {
-            # CafeF sources
-            'cafef_chungkhoan': '📈', 'cafef_batdongsan': '🏢', 'cafef_taichinh': '💰', 
-            'cafef_vimo': '📊', 'cafef_doanhnghiep': '🏭',
-            
-            # FREE international sources - FIXED mapping
-            'yahoo_finance_main': '💼', 'yahoo_finance_headlines': '📰', 'yahoo_finance_rss': '💼',
-            'cnn_money': '📺', 'marketwatch': '📊', 'business_insider': '💼', 
-            'cnbc': '📺', 'investing_com': '💹', 'investopedia': '📚',
-            'bbc_business': '🇬🇧', 'guardian_business': '🛡️', 'coindesk': '₿',
-            'nasdaq_news': '📈', 'seeking_alpha': '🔍', 'benzinga': '🚀'
-        }
-        
-        # Statistics
-        stats_field = f"🇻🇳 {domestic_count} • 🌍 {international_count} • 📊 {len(all_news)}"
-        fields_data.append(("📊", stats_field))
-        
-        for i, news in enumerate(page_news, 1):
-            emoji = emoji_map.get(news['source'], '📰')
-            title = news['title'][:50] + "..." if len(news['title']) > 50 else news['title']
-            source_display = source_names.get(news['source'], news['source'])
-            
-            field_name = f"{i}. {emoji} {title}"
-            field_value = f"🕰️ {news['published_str']} • 📰 {source_display}\n🔗 [Đọc bài viết]({news['link']})"
-            
-            fields_data.append((field_name, field_value))
-        
-        # Create embeds
-        embeds = create_safe_embed_with_fields(
-            f"📰 Trang {page}",
-            "",
-            fields_data,
-            0x00ff88
-        )
-        
-        save_user_news_enhanced(ctx.author.id, page_news, f"all_page_{page}")
-        
-        total_pages = (len(all_news) + items_per_page - 1) // items_per_page
-        
-        # Save current page context for !chitiet (for both cached and fresh data)
-        save_user_page_context(user_id, page_news, page)
-        
-        for i, embed in enumerate(embeds):
-            embed.set_footer(text=f"{page}/{total_pages}")
-        
-        for embed in embeds:
-            await ctx.send(embed=embed)
+        await send_news_listing(ctx, 'all', page)
         
     except Exception as e:
         await ctx.send(f"❌ Lỗi: {str(e)}")
@@ -1235,96 +2973,7 @@ async def get_international_news_enhanced(ctx, page=1):
     """Tin tức quốc tế - CONSISTENT PAGINATION"""
     try:
         page = max(1, int(page))
-        user_id = ctx.author.id
-        
-        # Check cached news first
-        cached_news, is_cached = get_or_collect_user_news(user_id, "out", RSS_FEEDS['international'])
-        
-        if is_cached:
-            news_list = cached_news
-        else:
-            loading_msg = await ctx.send(f"⏳")
-            
-            news_list = await collect_news_enhanced(RSS_FEEDS['international'], 20, use_global_dedup=False)
-            
-            # Cache for consistent pagination
-            save_user_news_enhanced(user_id, news_list, "out")
-            
-            await loading_msg.delete()
-        
-        items_per_page = 12
-        start_index = (page - 1) * items_per_page
-        end_index = start_index + items_per_page
-        page_news = news_list[start_index:end_index]
-        
-        if not page_news:
-            total_pages = (len(news_list) + items_per_page - 1) // items_per_page if news_list else 0
-            await ctx.send(f"❌ Không có tin tức ở trang {page}! Tổng cộng có {total_pages} trang.")
-            return
-        
-        # Prepare fields data
-        fields_data = []
-        
-        stats_field = f"🌍 {len(news_list)} tin"
-        if is_cached:
-            stats_field += " (cached)"
-        fields_data.append(("📊", stats_field))
-        
-        # FREE source names only - FIXED
-        source_names = {
-            'yahoo_finance_main': 'Yahoo RSS', 'yahoo_finance_headlines': 'Yahoo Headlines',
-            'yahoo_finance_rss': 'Yahoo Finance', 'cnn_money': 'CNN Money', 
-            'marketwatch': 'MarketWatch', 'business_insider': 'Business Insider',
-            'cnbc': 'CNBC', 'investing_com': 'Investing.com', 
-            'investopedia': 'Investopedia', 'bbc_business': 'BBC Business', 
-            'guardian_business': 'The Guardian', 'coindesk': 'CoinDesk', 
-            'nasdaq_news': 'Nasdaq', 'seeking_alpha': 'Seeking Alpha', 'benzinga': 'Benzinga'
-        }
-        
-        emoji_map = {
-            'yahoo_finance_main': '💼', 'yahoo_finance_headlines': '📰', 'yahoo_finance_rss': '💼',
-            'cnn_money': '📺', 'marketwatch': '📊', 'business_insider': '💼', 
-            'cnbc': '📺', 'investing_com': '💹', 'investopedia': '📚',
-            'bbc_business': '🇬🇧', 'guardian_business': '🛡️', 'coindesk': '₿',
-            'nasdaq_news': '📈', 'seeking_alpha': '🔍', 'benzinga': '🚀'
-        }
-        
-        for i, news in enumerate(page_news, 1):
-            emoji = emoji_map.get(news['source'], '💰')
-            title = news['title'][:50] + "..." if len(news['title']) > 50 else news['title']
-            source_display = source_names.get(news['source'], 'International Finance')
-            
-            field_name = f"{i}. {emoji} {title}"
-            field_value = f"🕰️ {news['published_str']} • 📰 {source_display}\n🔗 [Đọc bài viết]({news['link']})"
-            
-            fields_data.append((field_name, field_value))
-        
-        # Create embeds
-        embeds = create_safe_embed_with_fields(
-            f"🌍 Trang {page}",
-            "",
-            fields_data,
-            0x0066ff
-        )
-        
-        total_pages = (len(news_list) + items_per_page - 1) // items_per_page
-        
-        # Save current page context (for both cached and fresh data)
-        save_user_page_context(user_id, page_news, page)
-        
-        for i, embed in enumerate(embeds):
-            embed.set_footer(text=f"{page}/{total_pages}")
-        
-        for embed in embeds:
-            await ctx.send(embed=embed)
-        
-    except Exception as e:
-        await ctx.send(f"❌ Lỗi: {str(e)}")
-        for i, embed in enumerate(embeds):
-            embed.set_footer(text=f"Trang {page}/{total_pages} • !chitiet [số] • FREE ONLY")
-        
-        for embed in embeds:
-            await ctx.send(embed=embed)
+        await send_news_listing(ctx, 'out', page)
         
     except Exception as e:
         await ctx.send(f"❌ Lỗi: {str(e)}")
@@ -1334,63 +2983,41 @@ async def get_domestic_news_enhanced(ctx, page=1):
     """Tin tức trong nước - CafeF"""
     try:
         page = max(1, int(page))
-        loading_msg = await ctx.send(f"⏳")
+        await send_news_listing(ctx, 'in', page)
         
-        news_list = await collect_news_enhanced(RSS_FEEDS['domestic'], 15)
-        await loading_msg.delete()
-        
-        items_per_page = 12
-        start_index = (page - 1) * items_per_page
-        end_index = start_index + items_per_page
-        page_news = news_list[start_index:end_index]
-        
-        if not page_news:
-            total_pages = (len(news_list) + items_per_page - 1) // items_per_page
-            await ctx.send(f"❌ Không có tin tức ở trang {page}! Tổng cộng có {total_pages} trang.")
+    except Exception as e:
+        await ctx.send(f"❌ Lỗi: {str(e)}")
+
+@bot.command(name='tim')
+async def search_news_command(ctx, *, query=""):
+    """Tìm kiếm tin tức - không phân biệt dấu"""
+    try:
+        if not query.strip():
+            await ctx.send("❌ Nhập từ khóa! Ví dụ: `!tim lãi suất ngân hàng`")
             return
         
-        # Prepare fields data
-        fields_data = []
-        
-        stats_field = f"🇻🇳 {len(news_list)} tin"
-        fields_data.append(("📊", stats_field))
-        
-        source_names = {
-            'cafef_chungkhoan': 'CafeF CK', 'cafef_batdongsan': 'CafeF BĐS',
-            'cafef_taichinh': 'CafeF TC', 'cafef_vimo': 'CafeF VM', 'cafef_doanhnghiep': 'CafeF DN'
-        }
-        
-        emoji_map = {
-            'cafef_chungkhoan': '📈', 'cafef_batdongsan': '🏢', 
-            'cafef_taichinh': '💰', 'cafef_vimo': '📊', 'cafef_doanhnghiep': '🏭'
-        }
+        started = time.perf_counter()
+        results = search_index.search(query)
+        elapsed_ms = (time.perf_counter() - started) * 1000
         
-        for i, news in enumerate(page_news, 1):
-            emoji = emoji_map.get(news['source'], '📰')
-            title = news['title'][:55] + "..." if len(news['title']) > 55 else news['title']
-            source_display = source_names.get(news['source'], news['source'])
-            
-            field_name = f"{i}. {emoji} {title}"
-            field_value = f"🕰️ {news['published_str']} • 📰 {source_display}\n🔗 [Đọc bài viết]({news['link']})"
-            
-            fields_data.append((field_name, field_value))
-        
-        # Create embeds
-        embeds = create_safe_embed_with_fields(
-            f"🇻🇳 Trang {page}",
-            "",
-            fields_data,
-            0xff0000
-        )
+        if not results:
+            await ctx.send(f"❌ Không tìm thấy tin nào cho \"{query}\" trong {len(search_index)} bài.")
+            return
         
-        save_user_news_enhanced(ctx.author.id, page_news, f"in_page_{page}")
+        # Results become the user's current page, so !chitiet [số] works on them
+        snapshot = TimelineSnapshot('tim', iter(results), len(results))
+        timeline.set_cursor(ctx.author.id, snapshot, 'tim', 1)
         
-        total_pages = (len(news_list) + items_per_page - 1) // items_per_page
-        for i, embed in enumerate(embeds):
-            embed.set_footer(text=f"Trang {page}/{total_pages} • !chitiet [số]")
+        safe_fields = []
+        for i, news in enumerate(snapshot.page(1), 1):
+            label, value = news.listing_field
+            safe_fields.append((f"{i}. {label}", value))
         
+        embeds = create_embeds_from_safe_fields(f"🔎 {query}", "", safe_fields, 0xffaa00)
         for embed in embeds:
-            await ctx.send(embed=embed)
+            embed.set_footer(text=f"{len(results)} kết quả • {elapsed_ms:.1f}ms • !chitiet [số]")
+        
+        await send_embeds_batched(ctx, embeds)
         
     except Exception as e:
         await ctx.send(f"❌ Lỗi: {str(e)}")
@@ -1401,12 +3028,13 @@ async def get_news_detail_enhanced(ctx, news_number: int):
     try:
         user_id = ctx.author.id
         
-        if user_id not in user_news_cache:
+        cursor = timeline.get_cursor(user_id)
+        if cursor is None:
             await ctx.send("❌ Bạn chưa xem tin tức! Dùng `!all`, `!in`, hoặc `!out` trước.")
             return
         
-        user_data = user_news_cache[user_id]
-        news_list = user_data['news']
+        # Numbers refer to the page the user is currently looking at
+        news_list = cursor.snapshot.page(cursor.page)
         
         if news_number < 1 or news_number > len(news_list):
             await ctx.send(f"❌ Số không hợp lệ! Chọn từ 1 đến {len(news_list)}")
@@ -1417,32 +3045,23 @@ async def get_news_detail_enhanced(ctx, news_number: int):
         # Save as last detail for !hoi context
         save_user_last_detail(user_id, news)
         
-        # Source names mapping - FIXED
-        source_names = {
-            'cafef_chungkhoan': 'CafeF CK', 'cafef_batdongsan': 'CafeF BĐS',
-            'cafef_taichinh': 'CafeF TC', 'cafef_vimo': 'CafeF VM', 'cafef_doanhnghiep': 'CafeF DN',
-            'yahoo_finance_main': 'Yahoo RSS', 'yahoo_finance_headlines': 'Yahoo Headlines',
-            'marketwatch': 'MarketWatch', 'cnn_money': 'CNN Money',
-            'cnbc': 'CNBC', 'bbc_business': 'BBC Business', 'investing_com': 'Investing.com'
-        }
-        
-        source_name = source_names.get(news['source'], news['source'])
+        source_name = SOURCE_DISPLAY_NAMES.get(news.source, news.source)
         
-        if is_international_source(news['source']):
+        if is_international_source(news.source):
             loading_msg = await ctx.send(f"⏳ Gemini...")
         else:
             loading_msg = await ctx.send(f"⏳ Loading...")
         
         # Enhanced async content extraction
-        full_content = await extract_content_enhanced(news['link'], news['source'], news)
+        full_content = await extract_content_enhanced(news.link, news.source, news)
         
         await loading_msg.delete()
         
         # Create content with metadata
         main_title = f"📖 Tin {news_number}"
         
-        content_with_meta = f"**{news['title']}**\n"
-        content_with_meta += f"🕰️ {news['published_str']} • 📰 {source_name}\n\n"
+        content_with_meta = f"**{news.title}**\n"
+        content_with_meta += f"🕰️ {news.published_str} • 📰 {source_name}\n\n"
         content_with_meta += f"{full_content}"
         
         # Create optimized embeds
@@ -1452,18 +3071,28 @@ async def get_news_detail_enhanced(ctx, news_number: int):
         if optimized_embeds:
             safe_name, safe_value = validate_embed_field(
                 "🔗 Link gốc",
-                f"[Đọc bài viết gốc]({news['link']})"
+                f"[Đọc bài viết gốc]({news.link})"
             )
             optimized_embeds[-1].add_field(name=safe_name, value=safe_value, inline=False)
+            
+            # Other coverage of the same story
+            related = story_clusterer.related(news)
+            if related:
+                safe_name, safe_value = validate_embed_field(
+                    f"🧵 Cùng chủ đề ({len(related)})",
+                    "\n".join(
+                        f"• [{member.title[:80]}]({member.link}) - {SOURCE_DISPLAY_NAMES.get(member.source, member.source)}"
+                        for member in related
+                    )
+                )
+                if len(optimized_embeds[-1]) + len(safe_name) + len(safe_value) > DISCORD_EMBED_TOTAL_EMBED_LIMIT:
+                    optimized_embeds.append(discord.Embed(color=0x9932cc, timestamp=get_current_vietnam_datetime()))
+                optimized_embeds[-1].add_field(name=safe_name, value=safe_value, inline=False)
+            
             optimized_embeds[-1].set_footer(text=f"#{news_number}")
         
-        # Send all embeds
-        for i, embed in enumerate(optimized_embeds, 1):
-            if i == 1:
-                await ctx.send(embed=embed)
-            else:
-                await asyncio.sleep(0.5)
-                await ctx.send(embed=embed)
+        # Send all embeds in as few messages as possible
+        await send_embeds_batched(ctx, optimized_embeds)
         
     except ValueError:
         await ctx.send("❌ Vui lòng nhập số! Ví dụ: `!chitiet 5`")
@@ -1474,6 +3103,8 @@ async def get_news_detail_enhanced(ctx, news_number: int):
 async def gemini_debate_system(ctx, *, topic=""):
     """Tranh luận đa góc nhìn"""
     try:
+        topic, use_cache = split_bypass_flag(topic)
+        
         if not gemini_engine.available:
             await ctx.send("❌ Gemini AI không khả dụng.")
             return
@@ -1486,7 +3117,7 @@ async def gemini_debate_system(ctx, *, topic=""):
                 
                 if time_diff.total_seconds() < 1800:
                     article = last_detail['article']
-                    topic = f"Bài báo: {article['title']}"
+                    topic = f"Bài báo: {article.title}"
                 else:
                     await ctx.send("❌ Nhập chủ đề hoặc xem bài báo trước.")
                     return
@@ -1496,14 +3127,11 @@ async def gemini_debate_system(ctx, *, topic=""):
         
         loading_msg = await ctx.send(f"⏳")
         
-        debate_result = await gemini_engine.debate_perspectives(topic)
-        
-        optimized_embeds = create_optimized_embeds(f"🎭 Debate", debate_result, 0xff6600)
-        
-        await loading_msg.edit(embed=optimized_embeds[0])
-        
-        for embed in optimized_embeds[1:]:
-            await ctx.send(embed=embed)
+        # Stream the debate into the loading message as it is generated
+        await stream_to_discord(
+            ctx, loading_msg, f"🎭 Debate",
+            gemini_engine.stream_debate(topic, use_cache=use_cache), 0xff6600
+        )
         
     except Exception as e:
         await ctx.send(f"❌ Lỗi: {str(e)}")
@@ -1512,6 +3140,8 @@ async def gemini_debate_system(ctx, *, topic=""):
 async def enhanced_gemini_question(ctx, *, question):
     """Enhanced Gemini AI với context awareness"""
     try:
+        question, use_cache = split_bypass_flag(question)
+        
         if not gemini_engine.available:
             embed = create_safe_embed(
                 "⚠️ Gemini AI không khả dụng",
@@ -1533,10 +3163,10 @@ async def enhanced_gemini_question(ctx, *, question):
                 article = last_detail['article']
                 
                 # Extract content for context
-                article_content = await extract_content_enhanced(article['link'], article['source'], article)
+                article_content = await extract_content_enhanced(article.link, article.source, article)
                 
                 if article_content:
-                    context = f"BÀI BÁO LIÊN QUAN:\nTiêu đề: {article['title']}\nNguồn: {article['source']}\nNội dung: {article_content[:1500]}"
+                    context = f"BÀI BÁO LIÊN QUAN:\nTiêu đề: {article.title}\nNguồn: {article.source}\nNội dung: {article_content[:1500]}"
         
         progress_embed = create_safe_embed(
             "🤖 AI",
@@ -1546,24 +3176,13 @@ async def enhanced_gemini_question(ctx, *, question):
         
         progress_msg = await ctx.send(embed=progress_embed)
         
-        # Get Gemini response
+        # Stream Gemini response into the progress message
         if context:
-            analysis_result = await gemini_engine.analyze_article(context, question)
+            chunks = gemini_engine.stream_analysis(context, question, use_cache=use_cache)
         else:
-            analysis_result = await gemini_engine.ask_question(question, context)
+            chunks = gemini_engine.stream_question(question, context, use_cache=use_cache)
         
-        # Create optimized embeds
-        title = f"🤖 AI"
-        optimized_embeds = create_optimized_embeds(title, analysis_result, 0x00ff88)
-        
-        if optimized_embeds:
-            optimized_embeds[-1].set_footer(text=f"AI")
-        
-        # Send optimized embeds
-        await progress_msg.edit(embed=optimized_embeds[0])
-        
-        for embed in optimized_embeds[1:]:
-            await ctx.send(embed=embed)
+        await stream_to_discord(ctx, progress_msg, f"🤖 AI", chunks, 0x00ff88, footer=f"AI")
         
     except Exception as e:
         await ctx.send(f"❌ Lỗi hệ thống Gemini: {str(e)}")
@@ -1580,19 +3199,19 @@ async def help_command_optimized(ctx):
     
     safe_name1, safe_value1 = validate_embed_field(
         "📰 News",
-        "!all [page] - All\n!in [page] - Domestic\n!out [page] - International\n!chitiet [num] - Details"
+        "!all [page] - All\n!in [page] - Domestic\n!out [page] - International\n!chitiet [num] - Details\n!tim [từ khóa] - Search"
     )
     main_embed.add_field(name=safe_name1, value=safe_value1, inline=False)
     
     safe_name2, safe_value2 = validate_embed_field(
         "🤖 AI", 
-        "!hoi [question] - Ask AI\n!debate [topic] - Debate"
+        "!hoi [question] - Ask AI\n!debate [topic] - Debate\n--fresh - Bỏ qua cache (vd: !hoi --fresh ...)"
     )
     main_embed.add_field(name=safe_name2, value=safe_value2, inline=False)
     
     safe_name3, safe_value3 = validate_embed_field(
         "🔧 Debug",
-        "!status - Status\n!debug - Cache info\n!clear - Clear cache\n!test_dup [title] - Test duplicate"
+        "!status - Status\n!feeds - Feed polling\n!debug - Cache info\n!clear - Clear cache\n!test_dup [title] - Test duplicate"
     )
     main_embed.add_field(name=safe_name3, value=safe_value3, inline=False)
     
@@ -1601,41 +3220,32 @@ async def help_command_optimized(ctx):
 @bot.command(name='clear')
 async def clear_cache_command(ctx):
     """Clear global cache"""
-    global global_seen_articles
     cache_size = len(global_seen_articles)
     global_seen_articles.clear()
+    await article_db.save_seen(global_seen_articles)
     await ctx.send(f"🧹 Cleared {cache_size} articles from cache")
 
 @bot.command(name='debug')
 async def debug_command(ctx):
     """Debug cache status and duplicate logic"""
-    global global_seen_articles
-    
+    # Expire first - whatever remains is within the TTL
+    old_count = global_seen_articles.expire()
     cache_size = len(global_seen_articles)
-    current_time = get_current_vietnam_datetime()
-    
-    # Count recent vs old articles
-    recent_count = 0
-    old_count = 0
-    
-    for article_data in global_seen_articles.values():
-        time_diff = current_time - article_data['timestamp']
-        if time_diff.total_seconds() < (CACHE_EXPIRE_HOURS * 3600):
-            recent_count += 1
-        else:
-            old_count += 1
+    recent_count = cache_size
     
     # Show sample of cached titles
     sample_titles = []
-    for i, (key, data) in enumerate(list(global_seen_articles.items())[:3]):
-        normalized = normalize_title(data['title'])
-        sample_titles.append(f"• {normalized[:40]}...")
-        if i >= 2:  # Only show first 3
-            break
+    for article in islice(global_seen_articles.values(), 3):
+        sample_titles.append(f"• {article.title_key[:40]}...")
+    
+    coalesced = " • ".join(
+        f"{flight.name} {flight.stats['shared']}/{flight.stats['calls']}"
+        for flight in (fetch_flight, feed_flight, extract_flight, gemini_flight)
+    )
     
     embed = create_safe_embed(
         "🔧 Debug Info",
-        f"**Cache:** {cache_size} articles\n**Recent:** {recent_count}\n**Old:** {old_count}\n\n**Duplicate Logic:** EXACT title match only\n\n**Sample cached titles:**\n" + "\n".join(sample_titles),
+        f"**Cache:** {cache_size} articles\n**Recent:** {recent_count}\n**Expired now:** {old_count}\n**TTL:** {CACHE_EXPIRE_HOURS}h • **Max:** {MAX_GLOBAL_CACHE}\n**Coalesced:** {coalesced}\n**Timeline:** {len(timeline.latest)} snapshots • {len(timeline.cursors)} cursors • pages {listing_renderer.stats['hits']}/{listing_renderer.stats['hits'] + listing_renderer.stats['misses']}\n**Stories:** {len(story_clusterer.active)} active • {story_clusterer.stats['joined']}/{story_clusterer.stats['articles']} grouped{'' if story_clusterer.enabled else ' (numpy missing)'}\n\n**Duplicate Logic:** exact title/link + near-duplicate ≥{NEAR_DUP_THRESHOLD:.0%}\n\n**Sample cached titles:**\n" + "\n".join(sample_titles),
         0xff9900
     )
     
@@ -1650,22 +3260,66 @@ async def test_duplicate_logic(ctx, *, test_title=""):
     
     normalized = normalize_title(test_title)
     
-    # Check against cache
-    is_duplicate = False
-    matching_title = ""
+    # Check against the global index
+    global_seen_articles.expire()
+    matching_title = global_seen_articles.find_title(normalized)
+    is_duplicate = matching_title is not None
+    
+    # Title-to-title near-duplicate scores against the most recently ingested articles (capped)
+    nearest = near_duplicate_index.nearest(minhash_signature(test_title))
+    is_near_duplicate = bool(nearest) and nearest[0][0] >= NEAR_DUP_THRESHOLD
+    similar_lines = [
+        f"{'🔴' if similarity >= NEAR_DUP_THRESHOLD else '⚪'} {similarity:.0%} • {article.title[:60]} ({SOURCE_DISPLAY_NAMES.get(article.source, article.source)})"
+        for similarity, article in nearest
+    ]
     
-    for article_data in global_seen_articles.values():
-        existing_normalized = normalize_title(article_data['title'])
-        if normalized == existing_normalized:
-            is_duplicate = True
-            matching_title = article_data['title']
-            break
+    if is_duplicate:
+        result = '🔴 DUPLICATE'
+    elif is_near_duplicate:
+        result = '🟠 NEAR DUPLICATE'
+    else:
+        result = '✅ UNIQUE'
     
     embed = create_safe_embed(
         "🧪 Duplicate Test",
-        f"**Input:** {test_title}\n**Normalized:** {normalized}\n\n**Result:** {'🔴 DUPLICATE' if is_duplicate else '✅ UNIQUE'}" + 
-        (f"\n**Matches:** {matching_title}" if is_duplicate else ""),
-        0xff0000 if is_duplicate else 0x00ff00
+        f"**Input:** {test_title}\n**Normalized:** {normalized}\n\n**Result:** {result}" + 
+        (f"\n**Matches:** {matching_title}" if is_duplicate else "") +
+        f"\n\n**Similar ({len(near_duplicate_index)} bài, ngưỡng {NEAR_DUP_THRESHOLD:.0%}):**\n" +
+        ("\n".join(similar_lines) if similar_lines else "Không có bài tương tự"),
+        0xff0000 if is_duplicate else 0xff9900 if is_near_duplicate else 0x00ff00
+    )
+    
+    await ctx.send(embed=embed)
+
+@bot.command(name='feeds')
+async def feeds_command(ctx):
+    """Per-feed conditional GET counters"""
+    lines = []
+    total_hits = 0
+    total_misses = 0
+    
+    for category, feeds in RSS_FEEDS.items():
+        for source_name, source_url in feeds.items():
+            state = feed_http_cache.get(source_url)
+            if not state:
+                lines.append(f"• {source_name}: chưa poll")
+                continue
+            
+            total_hits += state['hits']
+            total_misses += state['misses']
+            lines.append(
+                f"• {source_name}: 304 {state['hits']} • 200 {state['misses']} • ❌ {state['errors']}"
+                f"{' • ETag' if state['etag'] else ''}{' • LM' if state['last_modified'] else ''}"
+                f" • 🆕 {state['new']}/♻️ {state['reused']}"
+            )
+    
+    total_requests = total_hits + total_misses
+    hit_rate = (total_hits / total_requests * 100) if total_requests else 0
+    
+    embed = create_safe_embed(
+        "📡 Feeds",
+        f"**Not modified:** {total_hits}/{total_requests} ({hit_rate:.0f}%)\n\n" + "\n".join(lines),
+        0x00ff88
     )
     
     await ctx.send(embed=embed)
@@ -1692,14 +3346,37 @@ async def status_command(ctx):
     gemini_status = "✅" if gemini_engine.available else "❌"
     safe_name2, safe_value2 = validate_embed_field(
         "🤖 AI",
-        f"Gemini: {gemini_status}\nCache: {global_cache_size}"
+        f"Gemini: {gemini_status}\nQueue: {gemini_scheduler.pending()} • ✅ {gemini_scheduler.stats['completed']}\nCache: {global_cache_size}\nStore: {len(article_store.sources)}/{total_sources}"
     )
     main_embed.add_field(name=safe_name2, value=safe_value2, inline=True)
     
+    cache_stats = content_cache.stats
+    safe_name3, safe_value3 = validate_embed_field(
+        "💾 Content",
+        f"Hit: {content_cache.hit_rate():.0f}%\nRAM: {cache_stats['memory_hits']} • Disk: {cache_stats['disk_hits']}\nMiss: {cache_stats['misses']}\n{len(content_cache.memory)} bài • {content_cache.memory_bytes // 1024} KB\nWarm: {article_db.stats['loaded']} bài ({article_db.stats['load_ms']:.0f}ms)"
+    )
+    main_embed.add_field(name=safe_name3, value=safe_value3, inline=True)
+    
+    ai_cache_stats = gemini_response_cache.stats
+    safe_name4, safe_value4 = validate_embed_field(
+        "🧠 AI Cache",
+        f"Hit: {gemini_response_cache.hit_rate():.0f}%\nRAM: {ai_cache_stats['memory_hits']} • Disk: {ai_cache_stats['disk_hits']}\nMiss: {ai_cache_stats['misses']}\n{len(gemini_response_cache.memory)} câu trả lời"
+    )
+    main_embed.add_field(name=safe_name4, value=safe_value4, inline=True)
+    
+    if precompute_pipeline.enabled:
+        pre_stats = precompute_pipeline.stats
+        safe_name5, safe_value5 = validate_embed_field(
+            "🌐 Dịch trước",
+            f"✅ {pre_stats['done']} • ⏭️ {pre_stats['stale'] + pre_stats['cached']}\nBỏ: {pre_stats['dropped']} • Hết quota: {pre_stats['over_budget']}\nQuota còn: {precompute_pipeline.budget_left()}/{PRECOMPUTE_BUDGET_PER_HOUR}/h"
+        )
+        main_embed.add_field(name=safe_name5, value=safe_value5, inline=True)
+    
     await ctx.send(embed=main_embed)
 
 # Run the bot
-if __name__ == "__main__":
+def main():
+    """Start the keep-alive server and the bot - called from run_bot.py"""
     try:
         keep_alive()
         print("🌐 Keep-alive server started")
@@ -1717,3 +3394,8 @@ if __name__ == "__main__":
         
     except Exception as e:
         print(f"❌ STARTUP ERROR: {e}")
+
+if __name__ == "__main__":
+    # Parser workers re-import the entry script; run_bot.py keeps that import tiny
+    print("⚠️ Started from news_bot.py - use run_bot.py so parser workers don't load the whole bot")
+    main()
@@ -0,0 +1,311 @@
+# ⚙️ PARSING WORKERS - Pure functions run by the parser process pool
+# Kept free of bot state and Discord imports: forkserver workers import only this module
+import io
+import re
+import time
+import email.utils
+from datetime import datetime, timezone
+import feedparser
+import chardet
+
+# 🚀 OPTIMIZED LIBRARIES - Enhanced for async operations
+try:
+    import trafilatura
+    TRAFILATURA_AVAILABLE = True
+except ImportError:
+    TRAFILATURA_AVAILABLE = False
+
+try:
+    import newspaper
+    from newspaper import Article
+    NEWSPAPER_AVAILABLE = True
+except ImportError:
+    NEWSPAPER_AVAILABLE = False
+
+try:
+    from lxml import etree
+    LXML_AVAILABLE = True
+except ImportError:
+    LXML_AVAILABLE = False
+
+try:
+    from bs4 import BeautifulSoup
+    BEAUTIFULSOUP_AVAILABLE = True
+except ImportError:
+    BEAUTIFULSOUP_AVAILABLE = False
+
+# 📡 FEEDS
+FEED_ITEM_TAGS = ('item', 'entry')
+FEED_DATE_TAGS = ('pubDate', 'published', 'updated', 'date')
+# Plain RSS 2.0, Atom and RSS 1.0 elements; anything else (media:, atom:link in RSS, ...) is an extension
+FEED_CORE_NAMESPACES = (None, 'http://www.w3.org/2005/Atom', 'http://purl.org/rss/1.0/')
+FEED_EXTRA_FIELDS = {('http://purl.org/dc/elements/1.1/', 'date'): 'date'}
+
+def parse_feed_date(value):
+    """RFC 822 (RSS) or ISO 8601 (Atom, dc:date) date -> UTC time tuple, None if unparseable"""
+    value = (value or "").strip()
+    if not value:
+        return None
+    
+    parsed = email.utils.parsedate_tz(value)
+    if parsed:
+        return tuple(time.gmtime(email.utils.mktime_tz(parsed)))
+    
+    try:
+        dt = datetime.fromisoformat(value.replace('Z', '+00:00'))
+        if dt.tzinfo is None:
+            dt = dt.replace(tzinfo=timezone.utc)
+        return tuple(dt.utctimetuple())
+    except ValueError:
+        return None
+
+def feed_element_entry(element):
+    """Plain entry dict from an RSS <item> or Atom <entry> element"""
+    fields = {}
+    link = None
+    
+    for child in element:
+        if not isinstance(child.tag, str):
+            continue  # comments / processing instructions
+        qname = etree.QName(child)
+        name = qname.localname
+        
+        if qname.namespace not in FEED_CORE_NAMESPACES:
+            # Extensions never override core fields - only whitelisted extras are kept
+            extra = FEED_EXTRA_FIELDS.get((qname.namespace, name))
+            if extra and extra not in fields:
+                fields[extra] = ''.join(child.itertext())
+            continue
+        
+        if name == 'link':
+            # Atom: <link rel="alternate" href="..."/>, RSS: <link>url</link>
+            href = child.get('href')
+            if href:
+                # rel="self" / "enclosure" / ... point elsewhere
+                if link is None and child.get('rel', 'alternate') == 'alternate':
+                    link = href.strip()
+            elif child.text and link is None:
+                link = child.text.strip()
+        elif name not in fields:
+            fields[name] = ''.join(child.itertext())
+    
+    time_tuple = None
+    for date_tag in FEED_DATE_TAGS:
+        time_tuple = parse_feed_date(fields.get(date_tag))
+        if time_tuple:
+            break
+    
+    return {
+        'title': fields.get('title'),
+        'link': link,
+        'guid': (fields.get('guid') or fields.get('id') or '').strip() or None,
+        'time_tuple': time_tuple,
+        'summary': fields.get('description') or fields.get('summary') or ""
+    }
+
+def parse_feed_entries_fast(content, limit):
+    """Incremental lxml parse that stops after `limit` items; raises on malformed XML"""
+    entries = []
+    context = etree.iterparse(
+        io.BytesIO(content),
+        events=('end',),
+        resolve_entities=False,
+        no_network=True,
+        huge_tree=False
+    )
+    
+    for _, element in context:
+        if not isinstance(element.tag, str):
+            continue
+        qname = etree.QName(element)
+        if qname.namespace not in FEED_CORE_NAMESPACES or qname.localname not in FEED_ITEM_TAGS:
+            continue
+        
+        entries.append(feed_element_entry(element))
+        element.clear()  # keep memory flat on large feeds
+        
+        if len(entries) >= limit:
+            break
+    
+    return entries
+
+def parse_feed_entries(content, limit):
+    """Parse a feed into plain entry dicts (picklable, no feedparser objects)"""
+    # Fast path: stream only the first `limit` items with lxml
+    if LXML_AVAILABLE and isinstance(content, bytes):
+        try:
+            entries = parse_feed_entries_fast(content, limit)
+            if entries:
+                return entries
+        except Exception:
+            pass  # malformed or unusual feed - feedparser is more forgiving
+    
+    feed = feedparser.parse(content)
+    
+    if not feed or not hasattr(feed, 'entries'):
+        return []
+    
+    entries = []
+    for entry in feed.entries[:limit]:
+        time_tuple = None
+        if hasattr(entry, 'published_parsed') and entry.published_parsed:
+            time_tuple = tuple(entry.published_parsed)
+        elif hasattr(entry, 'updated_parsed') and entry.updated_parsed:
+            time_tuple = tuple(entry.updated_parsed)
+        
+        summary = ""
+        if hasattr(entry, 'summary'):
+            summary = entry.summary
+        elif hasattr(entry, 'description'):
+            summary = entry.description
+        
+        entries.append({
+            'title': entry.title if hasattr(entry, 'title') else None,
+            'link': entry.link if hasattr(entry, 'link') else None,
+            'guid': entry.get('id'),
+            'time_tuple': time_tuple,
+            'summary': summary
+        })
+    
+    return entries
+
+# 📄 ARTICLES
+def clean_content_enhanced(content):
+    """Enhanced content cleaning for CafeF"""
+    if not content:
+        return content
+    
+    unwanted_patterns = [
+        r'Theo.*?CafeF.*?',
+        r'Nguồn.*?:.*?',
+        r'Tags:.*?$',
+        r'Từ khóa:.*?$',
+        r'Đăng ký.*?nhận tin.*?',
+        r'Like.*?Fanpage.*?',
+        r'Follow.*?us.*?'
+    ]
+    
+    for pattern in unwanted_patterns:
+        content = re.sub(pattern, '', content, flags=re.IGNORECASE | re.DOTALL)
+    
+    content = re.sub(r'\s+', ' ', content)
+    content = re.sub(r'\n\s*\n', '\n', content)
+    
+    return content.strip()
+
+def extract_article_text(content):
+    """Trafilatura then BeautifulSoup extraction of article text; None if both fail"""
+    # Method 1: Trafilatura with enhanced config for full content
+    if TRAFILATURA_AVAILABLE:
+        try:
+            result = trafilatura.bare_extraction(
+                content,
+                include_comments=False,
+                include_tables=True,
+                include_links=False,
+                include_images=False,
+                favor_precision=False,  # Changed to False for more content
+                favor_recall=True,      # Added for maximum content
+                with_metadata=True,
+                prune_xpath=[],         # Don't prune anything
+                only_with_metadata=False
+            )
+            
+            if result and result.get('text') and len(result['text']) > 200:
+                full_text = result['text']
+                
+                # Try to get more content with different settings
+                if len(full_text) < 1000:
+                    result2 = trafilatura.extract(
+                        content,
+                        include_comments=True,
+                        include_tables=True,
+                        include_links=True,
+                        favor_precision=False,
+                        favor_recall=True
+                    )
+                    if result2 and len(result2) > len(full_text):
+                        full_text = result2
+                
+                return full_text.strip()
+        except Exception as e:
+            print(f"⚠️ Trafilatura failed: {e}")
+    
+    # Method 2: Enhanced BeautifulSoup with multiple strategies
+    if BEAUTIFULSOUP_AVAILABLE:
+        try:
+            soup = BeautifulSoup(content, 'html.parser')
+            
+            # Strategy 1: CafeF specific selectors
+            content_selectors = [
+                'div.detail-content',
+                'div.fck_detail', 
+                'div.content-detail',
+                'div.article-content',
+                'div.entry-content',
+                'div.post-content',
+                'article',
+                'main',
+                '.article-body',
+                '.content-body',
+                '.post-body'
+            ]
+            
+            extracted_text = ""
+            for selector in content_selectors:
+                elements = soup.select(selector)
+                if elements:
+                    for element in elements:
+                        text = element.get_text(strip=True)
+                        if len(text) > len(extracted_text):
+                            extracted_text = text
+            
+            # Strategy 2: Find all paragraphs and combine
+            if len(extracted_text) < 500:
+                all_paragraphs = soup.find_all('p')
+                paragraph_texts = []
+                for p in all_paragraphs:
+                    p_text = p.get_text(strip=True)
+                    if len(p_text) > 50:  # Only substantial paragraphs
+                        paragraph_texts.append(p_text)
+                
+                combined_text = '\n\n'.join(paragraph_texts)
+                if len(combined_text) > len(extracted_text):
+                    extracted_text = combined_text
+            
+            if extracted_text and len(extracted_text) > 300:
+                cleaned_content = clean_content_enhanced(extracted_text)
+                return cleaned_content.strip()
+                
+        except Exception as e:
+            print(f"⚠️ BeautifulSoup failed: {e}")
+    
+    return None
+
+def decode_html_bytes(content):
+    """Decode downloaded HTML, guessing the charset when it isn't UTF-8"""
+    if isinstance(content, str):
+        return content
+    
+    try:
+        return content.decode('utf-8')
+    except UnicodeDecodeError:
+        encoding = chardet.detect(content[:50000]).get('encoding') or 'utf-8'
+        return content.decode(encoding, errors='replace')
+
+def extract_with_newspaper(url, content):
+    """Newspaper3k parse of already-downloaded HTML - never re-downloads; None if it fails"""
+    if not NEWSPAPER_AVAILABLE:
+        return None
+    
+    try:
+        article = Article(url)
+        article.download(input_html=decode_html_bytes(content))
+        article.parse()
+        
+        if article.text and len(article.text) > 300:
+            return article.text.strip()
+    except Exception as e:
+        print(f"⚠️ Newspaper3k failed: {e}")
+    
+    return None
@@ -0,0 +1,7 @@
+# 🚀 LAUNCHER - Start the bot with: python run_bot.py
+# Forkserver/spawn parser workers re-import the entry script as __mp_main__. Keeping it
+# this small means each worker loads parsing_workers only, not discord.py, Gemini and
+# every module-level cache in news_bot.
+if __name__ == "__main__":
+    import news_bot
+    news_bot.main()